@@ -17,6 +17,8 @@ class ContextManager:
         self.config = get_config().get('context', {})
         self.contexts: Dict[str, ContextTemplate] = {}
         self.parameter_defaults: Dict[str, Any] = {}
+        # Bumped whenever a context template or its variables change
+        self._revision = 0
         self._load_contexts()
         self._load_default_contexts()
         self._load_parameter_defaults()
@@ -105,6 +107,7 @@ class ContextManager:
         if not context:
             return
         
+        self._revision += 1
         contexts_dir = self._get_contexts_path()
         filename = os.path.join(contexts_dir, f"{name}.json")
         
@@ -124,6 +127,10 @@ class ContextManager:
             for name, context in self.contexts.items()
         ]
     
+    def has_context(self, name: str) -> bool:
+        """Check whether a context exists"""
+        return name in self.contexts
+    
     def _get_context_description(self, context: ContextTemplate) -> str:
         """Generate a description for a context"""
         # Extract first line as description
@@ -151,6 +158,10 @@ class ContextManager:
         
         return True
     
+    def active_key(self) -> tuple:
+        """Get a key identifying the current active context content"""
+        return (self.get_active_context(), self._revision)
+    
     def get_active_context_content(self) -> Optional[str]:
         """Get the content of the active context"""
         active = self.get_active_context()
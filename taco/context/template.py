@@ -4,6 +4,9 @@ TACO Context Template Management
 import re
 from typing import Dict, Any
 
+# Any placeholder left unfilled after variable substitution
+_PLACEHOLDER_RE = re.compile(r'\{[^}]+\}')
+
 class ContextTemplate:
     """Manages context templates and their variables"""
     
@@ -22,6 +25,6 @@ class ContextTemplate:
             result = result.replace(placeholder, str(value))
         
         # Replace any remaining placeholders with empty strings
-        result = re.sub(r'\{[^}]+\}', '', result)
+        result = _PLACEHOLDER_RE.sub('', result)
         
         return result
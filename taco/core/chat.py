@@ -4,18 +4,23 @@ Main orchestrator for chat sessions, coordinating between components.
 Enhanced with context-aware parameter handling and comprehensive debugging.
 """
 import os
-import json
+import mmap
 import sys
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, List, Any
 from rich.console import Console
 from prompt_toolkit import PromptSession
 from prompt_toolkit.history import FileHistory
+from prompt_toolkit.completion import WordCompleter
 
 from taco.core.model import ModelManager
 from taco.tools.registry import ToolRegistry
 from taco.context.engine import ContextManager
 from taco.utils.display import display_thinking, display_system_message
 from taco.utils.debug_logger import debug_logger
+from taco.utils import jsonio
 
 # Import core components
 from taco.core.tool_stack import ToolStack
@@ -25,6 +30,18 @@ from taco.core.debug_display import DebugDisplay
 
 console = Console()
 
+# Commands that end the interactive session
+EXIT_COMMANDS = ('/bye', '/exit', '/quit', '/q')
+
+# Upper bound on tools run concurrently for a single response
+MAX_TOOL_WORKERS = 8
+
+# Seconds the history writer waits to coalesce bursts of save requests
+HISTORY_SAVE_DELAY = 0.5
+
+# History files at least this large are memory-mapped when loading
+HISTORY_MMAP_THRESHOLD = 1024 * 1024
+
 class ChatSession:
     """Manages interactive chat sessions with the LLM"""
     
@@ -48,6 +65,31 @@ class ChatSession:
             # Initialize history
             self.history = []
             
+            # Active context content cache: (context key, content)
+            self._ctx_cache = (None, None)
+            
+            # System message reused until its parts change
+            self._system_message = None
+            self._system_key = None
+            
+            # Tools prompt cache: (registry version, prompt)
+            self._tools_prompt_cache = (None, None)
+            
+            # Messages sent to the model: system slot followed by the history,
+            # extended with new history entries rather than rebuilt each turn
+            self._messages_buffer = [{"role": "system", "content": ""}]
+            self._buffer_history = None
+            self._buffer_synced = 0
+            
+            # Background history writer: path -> (history list, length) awaiting a write
+            self._history_queue = queue.Queue()
+            self._history_pending = {}
+            # path -> (history list, length) already on disk, so saves only append
+            self._history_saved = {}
+            self._history_lock = threading.Lock()
+            self._history_stop = threading.Event()
+            self._history_thread = None
+            
             # Session modes
             self.debug_mode = False
             
@@ -77,18 +119,12 @@ class ChatSession:
     
     def _add_project_commands(self):
         """Add project commands to the command handler"""
-        original_handle = self.command_handler.handle_command
-        
-        def enhanced_handle_command(command: str) -> str:
-            # Check for project commands first
-            if command.startswith('/project'):
-                parts = command.split()
-                return self._handle_project_command(parts[0], parts[1:])
-            
-            # Fall back to original handler
-            return original_handle(command)
-        
-        self.command_handler.handle_command = enhanced_handle_command
+        # Per-handler copy of the dispatch table, so the class table stays untouched
+        handler = self.command_handler
+        handler._commands = {
+            **handler._commands,
+            '/project': lambda _, args: self._handle_project_command('/project', args.split())
+        }
     
     def _handle_project_command(self, command: str, args: List[str]) -> str:
         """Handle project-related commands"""
@@ -97,14 +133,15 @@ class ChatSession:
                 # Show current project info
                 project_info = self.context_manager.get_project_info()
                 if project_info:
-                    result = f"Current project: {project_info['name']}\n"
-                    result += f"Working directory: {project_info['workingdir']}\n"
-                    result += f"Language: {project_info['language']}\n"
+                    parts = [
+                        f"Current project: {project_info['name']}\n",
+                        f"Working directory: {project_info['workingdir']}\n",
+                        f"Language: {project_info['language']}\n"
+                    ]
                     if project_info['defaults']:
-                        result += "\nProject defaults:\n"
-                        for key, value in project_info['defaults'].items():
-                            result += f"  {key}: {value}\n"
-                    return result
+                        parts.append("\nProject defaults:\n")
+                        parts.extend(f"  {key}: {value}\n" for key, value in project_info['defaults'].items())
+                    return "".join(parts)
                 else:
                     return "No active project. Use '/project new <name>' to create one."
             
@@ -140,8 +177,7 @@ class ChatSession:
                 context_name = f"project_{project_name}"
                 
                 # Check if project exists
-                contexts = self.context_manager.list_contexts()
-                if not any(ctx['name'] == context_name for ctx in contexts):
+                if not self.context_manager.has_context(context_name):
                     return f"Project '{project_name}' not found"
                 
                 success = self.context_manager.set_active_context(context_name)
@@ -167,8 +203,7 @@ class ChatSession:
             elif subcommand == 'info':
                 project_info = self.context_manager.get_project_info()
                 if project_info:
-                    import json
-                    return json.dumps(project_info, indent=2)
+                    return jsonio.dumps(project_info, indent=True)
                 else:
                     return "No active project"
             
@@ -177,17 +212,71 @@ class ChatSession:
         
         return "Unknown command"
     
+    def _get_active_context_content(self) -> Optional[str]:
+        """Get the active context content, reusing it while the context is unchanged"""
+        active_key = getattr(self.context_manager, 'active_key', None)
+        if active_key is None:
+            return self.context_manager.get_active_context_content()
+        
+        key = active_key()
+        if key != self._ctx_cache[0]:
+            self._ctx_cache = (key, self.context_manager.get_active_context_content())
+        return self._ctx_cache[1]
+    
+    def _get_system_message(self, context: Optional[str], tools_prompt: str,
+                            tool_stack_context: str) -> Optional[Dict[str, str]]:
+        """Get the system message, rebuilding it only when one of its parts changes"""
+        key = (context, tools_prompt, tool_stack_context)
+        if key == self._system_key:
+            return self._system_message
+        
+        system_content = ""
+        
+        if context:
+            system_content += context + "\n\n"
+        
+        if tools_prompt:
+            system_content += tools_prompt
+        
+        if tool_stack_context:
+            system_content += tool_stack_context
+        
+        self._system_message = {"role": "system", "content": system_content} if system_content else None
+        self._system_key = key
+        return self._system_message
+    
+    def _sync_messages_buffer(self, system_message: Optional[Dict[str, str]]) -> List[Dict[str, str]]:
+        """Bring the message buffer up to date with the history and return the messages to send"""
+        buffer = self._messages_buffer
+        if self._buffer_history is not self.history or self._buffer_synced > len(self.history):
+            # History was replaced (/clear, load_history), so start over
+            del buffer[1:]
+            self._buffer_history = self.history
+            self._buffer_synced = 0
+        
+        buffer.extend(self.history[self._buffer_synced:])
+        self._buffer_synced = len(self.history)
+        
+        if system_message is None:
+            return buffer[1:]
+        buffer[0] = system_message
+        return buffer
+    
     def _get_tools_prompt(self) -> str:
         """Generate a prompt that describes available tools to the LLM"""
-        tools_description = """Find the best tool to match the question. If no tool matches well, answer the question directly.
+        version = self.tool_registry.version
+        if self._tools_prompt_cache[0] == version:
+            return self._tools_prompt_cache[1]
+        
+        parts = ["""Find the best tool to match the question. If no tool matches well, answer the question directly.
 
     Available tools:
-    """
+    """]
         
-        for tool_name, tool in self.tool_registry.tools.items():
-            tools_description += f"- {tool.get_description()}\n"
+        for tool in self.tool_registry.tools.values():
+            parts.append(tool.get_prompt_fragment())
         
-        tools_description += """
+        parts.append("""
     To use a tool, specify it in JSON format:
     ```json
     {
@@ -204,8 +293,10 @@ class ChatSession:
     1. Choose the most appropriate tool
     2. The system will provide usage instructions
     3. Apply the tool to the user's original request using those instructions
-    """
+    """)
         
+        tools_description = "".join(parts)
+        self._tools_prompt_cache = (version, tools_description)
         return tools_description
 
     def _communicate_with_ollama(self, messages: List[Dict[str, str]], 
@@ -220,7 +311,7 @@ class ChatSession:
             previous_tool_results: Tool results to include in debug info
         
         Returns:
-            The response from Ollama
+            The cleaned response from Ollama
         """
         # Store debug information for the tree view
         if self.debug_mode:
@@ -234,10 +325,10 @@ class ChatSession:
                     'tool_results': []
                 }
             
-            # Add this request to the debug data
+            # Add this request to the debug data (a snapshot, since the buffer keeps changing)
             self._debug_tree_data['requests'].append({
                 'name': context_name,
-                'messages': messages
+                'messages': list(messages)
             })
         
         # Log the request if in debug mode
@@ -256,6 +347,9 @@ class ChatSession:
                 messages
             )
         
+        # Clean the response once; everything downstream uses this copy
+        response = self.message_handler.clean_response_content(response)
+        
         # Log the response if in debug mode
         if self.debug_mode:
             debug_logger.log(f"== {context_name} Response from Ollama ==", "RESPONSE", "bright_blue")
@@ -283,16 +377,17 @@ class ChatSession:
 
     def _execute_tool_calls(self, tool_calls: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Execute tool calls and return results with details"""
-        results = []
+        results = [None] * len(tool_calls)
+        pending = []
         
         if self.debug_mode:
             debug_logger.log(f"Processing {len(tool_calls)} tool calls", "CHAT", "blue")
-            debug_logger.log(f"Current tool stack: {len(self.tool_stack.stack)} items", "CHAT", "blue")
-            if self.tool_stack.stack:
-                for i, item in enumerate(self.tool_stack.stack):
-                    debug_logger.log(f"Stack item {i}: {item['tool']}", "CHAT", "blue")
+            debug_logger.log(f"Current tool stack: {len(self.tool_stack.tools)} items", "CHAT", "blue")
+            if self.tool_stack.tools:
+                for i, name in enumerate(self.tool_stack.tools):
+                    debug_logger.log(f"Stack item {i}: {name}", "CHAT", "blue")
         
-        for call in tool_calls:
+        for index, call in enumerate(tool_calls):
             tool_name = call['tool_name']
             params = call['parameters']
             
@@ -306,29 +401,38 @@ class ChatSession:
                     debug_logger.log(f"Remapping 'code' parameter to 'prompt' for create_code tool", "TOOL_CALL", "yellow")
                 params['prompt'] = params.pop('code')
             
+            # Only thread-safe calls that take nothing from context run side by
+            # side; the others run on their own once earlier calls have finished
+            concurrent = self._can_run_concurrently(tool_name, params)
+            # Each pending call may push a frame, which the depth check must see
+            if pending and (not concurrent or
+                            self.tool_stack.get_depth() + len(pending) >= self.tool_stack.max_stack_depth):
+                self._finish_tool_calls(pending, results)
+                pending = []
+            
             # Check stack depth before executing
             if not self.tool_stack.check_depth_limit():
-                results.append({
+                results[index] = {
                     'tool': tool_name,
                     'parameters': params,
                     'error': "Tool stack depth limit reached",
                     'success': False
-                })
+                }
                 continue
             
             # Get the tool
             tool = self.tool_registry.tools.get(tool_name)
             if not tool:
-                results.append({
+                results[index] = {
                     'tool': tool_name,
                     'parameters': params,
                     'error': f"Tool '{tool_name}' not found",
                     'success': False
-                })
+                }
                 continue
             
             # NEW: If this is the initial tool selection, get usage instructions directly
-            if not self.tool_stack.stack:
+            if not self.tool_stack.tools:
                 # Get usage instructions directly from the tool
                 usage_instructions = tool.get_usage_instructions()
                 
@@ -339,7 +443,7 @@ class ChatSession:
                     debug_logger.log(usage_instructions, "TOOL_USAGE", "magenta")
                 
                 # Return the usage instructions as a result
-                results.append({
+                results[index] = {
                     'tool': tool_name,
                     'parameters': {'mode': 'get_usage_instructions'},
                     'result': {
@@ -348,28 +452,25 @@ class ChatSession:
                         'tool_name': tool_name
                     },
                     'success': True
-                })
+                }
                 continue
             
             # Normal tool execution follows...
             try:
                 # Check for missing parameters using context
-                func = tool.func
-                if hasattr(func, '__wrapped__'):  # Get original function if wrapped
-                    func = func.__wrapped__
+                func = tool.unwrapped_func  # Unwrapped from any decorators at registration
                 
                 # Get function signature for debugging
                 if self.debug_mode:
-                    import inspect
-                    sig = inspect.signature(func)
+                    sig = tool.unwrapped_sig
                     debug_logger.log(f"Tool function signature: {sig}", "TOOL_CALL", "blue")
                     debug_logger.log(f"Expected parameters: {list(sig.parameters.keys())}", "TOOL_CALL", "blue")
                 
                 updated_params, missing_params = self.context_manager.check_missing_parameters(func, params)
                 
                 if self.debug_mode:
-                    debug_logger.log(f"Original params: {json.dumps(params)}", "TOOL_CALL", "blue")
-                    debug_logger.log(f"Updated params: {json.dumps(updated_params)}", "TOOL_CALL", "blue")
+                    debug_logger.log(f"Original params: {jsonio.dumps(params)}", "TOOL_CALL", "blue")
+                    debug_logger.log(f"Updated params: {jsonio.dumps(updated_params)}", "TOOL_CALL", "blue")
                     if missing_params:
                         debug_logger.log(f"Missing params: {missing_params}", "TOOL_CALL", "yellow")
                     else:
@@ -385,11 +486,48 @@ class ChatSession:
                         converted_params[param_name] = param_value
                 
                 if self.debug_mode:
-                    debug_logger.log(f"Converted params: {json.dumps(converted_params)}", "TOOL_CALL", "blue")
+                    debug_logger.log(f"Converted params: {jsonio.dumps(converted_params)}", "TOOL_CALL", "blue")
                 
-                # Execute with properly typed parameters
-                result = tool.execute(**converted_params)
+                pending.append((index, tool_name, params, tool, converted_params))
+                if not concurrent:
+                    self._finish_tool_calls(pending, results)
+                    pending = []
                 
+            except Exception as e:
+                results[index] = self._tool_error_result(tool_name, params, e)
+        
+        self._finish_tool_calls(pending, results)
+        
+        if self.debug_mode:
+            debug_logger.log(f"Final tool stack after execution: {len(self.tool_stack.tools)} items", "CHAT", "blue")
+            if self.tool_stack.tools:
+                for i, name in enumerate(self.tool_stack.tools):
+                    debug_logger.log(f"Stack item {i}: {name}", "CHAT", "blue")
+        
+        return results
+    
+    def _can_run_concurrently(self, tool_name: str, params: Dict[str, Any]) -> bool:
+        """Check whether a call may run alongside other calls from the same response"""
+        tool = self.tool_registry.tools.get(tool_name)
+        if tool is None or not tool.thread_safe:
+            return False
+        
+        # Parameters left out are filled from context, which earlier calls update
+        return all(params.get(name) not in (None, "")
+                   for name, param in tool.unwrapped_sig.parameters.items()
+                   if param.kind not in (param.VAR_POSITIONAL, param.VAR_KEYWORD))
+    
+    def _finish_tool_calls(self, pending: List[tuple], results: List[Dict[str, Any]]) -> None:
+        """Execute prepared tool calls, then record their results in call order"""
+        # Execute with properly typed parameters, collecting results in call order
+        outcomes = self._run_tools(pending)
+        
+        for (index, tool_name, params, tool, converted_params), (result, error) in zip(pending, outcomes):
+            if error is not None:
+                results[index] = self._tool_error_result(tool_name, params, error)
+                continue
+            
+            try:
                 if self.debug_mode:
                     debug_logger.log(f"Tool execution result:", "TOOL_RESULT", "green")
                     debug_logger.log_json(result, "Result")
@@ -409,12 +547,12 @@ class ChatSession:
                         'parameter_names': result.get('parameter_names', [])
                     })
                 
-                results.append({
+                results[index] = {
                     'tool': tool_name,
                     'parameters': params,
                     'result': result,
                     'success': True
-                })
+                }
                 
                 # Update context with used parameters (non-persistent)
                 for param_name, value in converted_params.items():
@@ -422,26 +560,39 @@ class ChatSession:
                         self.context_manager.update_parameter_default(param_name, value, persist=False)
                         
             except Exception as e:
-                if self.debug_mode:
-                    debug_logger.log(f"Tool execution error: {str(e)}", "TOOL_ERROR", "red")
-                    import traceback
-                    debug_logger.log(traceback.format_exc(), "TOOL_ERROR", "red")
-                
-                results.append({
-                    'tool': tool_name,
-                    'parameters': params,
-                    'error': str(e),
-                    'success': False
-                })
+                results[index] = self._tool_error_result(tool_name, params, e)
+
+    def _run_tools(self, pending: List[tuple]) -> List[tuple]:
+        """Execute prepared tool calls, returning (result, error) pairs in submission order"""
+        def run(tool, converted_params):
+            try:
+                return tool.execute(**converted_params), None
+            except Exception as e:
+                return None, e
+        
+        if len(pending) <= 1:
+            return [run(tool, converted_params) for _, _, _, tool, converted_params in pending]
         
+        # Tools are mostly I/O bound, so overlap their latencies
+        with ThreadPoolExecutor(max_workers=min(MAX_TOOL_WORKERS, len(pending))) as executor:
+            futures = [executor.submit(run, tool, converted_params)
+                       for _, _, _, tool, converted_params in pending]
+            return [future.result() for future in futures]
+    
+    def _tool_error_result(self, tool_name: str, params: Dict[str, Any], error: Exception) -> Dict[str, Any]:
+        """Log a tool failure and build its result entry"""
         if self.debug_mode:
-            debug_logger.log(f"Final tool stack after execution: {len(self.tool_stack.stack)} items", "CHAT", "blue")
-            if self.tool_stack.stack:
-                for i, item in enumerate(self.tool_stack.stack):
-                    debug_logger.log(f"Stack item {i}: {item['tool']}", "CHAT", "blue")
+            debug_logger.log(f"Tool execution error: {str(error)}", "TOOL_ERROR", "red")
+            import traceback
+            debug_logger.log("".join(traceback.format_exception(type(error), error, error.__traceback__)), "TOOL_ERROR", "red")
         
-        return results
-
+        return {
+            'tool': tool_name,
+            'parameters': params,
+            'error': str(error),
+            'success': False
+        }
+    
     def _show_debug_tree(self):
         """Show the debug tree with all communication data"""
         # Call debug display with all the collected information
@@ -505,6 +656,10 @@ class ChatSession:
         
         # Check if the question is a command
         if question.startswith('/'):
+            # Manual tool invocation is itself a slash command
+            tool_result = self._check_for_tool_usage(question)
+            if tool_result:
+                return tool_result
             return self.command_handler.handle_command(question)
         
         # Check for context switch
@@ -513,63 +668,45 @@ class ChatSession:
             self.tool_stack.clear()
         
         # Check for empty response during tool workflow
-        if not question and self.tool_stack.stack:
+        if not question and self.tool_stack.tools:
             cancel_response = self.tool_stack.handle_empty_response()
             if cancel_response:
                 return cancel_response
         
         # If this is the start of a new workflow, save the original prompt
-        if not self.tool_stack.stack and question:
+        if not self.tool_stack.tools and question:
             self.tool_stack.set_original_prompt(question)
         
-        # Check for manual tool usage
-        tool_result = self._check_for_tool_usage(question)
-        if tool_result:
-            return tool_result
-        
         # Add to history
         self.history.append({"role": "user", "content": question})
         
         # Get active context
-        context = self.context_manager.get_active_context_content()
+        context = self._get_active_context_content()
         
         # Prepare system message with tools description and tool stack context
         tools_prompt = self._get_tools_prompt()
         tool_stack_context = self.tool_stack.get_system_context()
-        system_content = ""
-        
-        if context:
-            system_content += context + "\n\n"
-        
-        if tools_prompt:
-            system_content += tools_prompt
-        
-        if tool_stack_context:
-            system_content += tool_stack_context
+        system_message = self._get_system_message(context, tools_prompt, tool_stack_context)
         
         # Prepare messages
-        messages = []
-        if system_content:
-            messages.append({"role": "system", "content": system_content})
+        messages = self._sync_messages_buffer(system_message)
         
         # For the initial tool selection, modify the user's question
-        modified_history = self.history.copy()
-        if not self.tool_stack.stack and modified_history:  # Only on initial call
-            last_message = modified_history[-1]
-            if last_message["role"] == "user":
-                # Modify the question to force tool selection
-                modified_history[-1] = {
-                    "role": "user", 
-                    "content": f"Select the best tool to handle this request: {last_message['content']}"
-                }
-        
-        messages.extend(modified_history)
+        last_message = messages[-1]
+        select_tool = not self.tool_stack.tools and last_message["role"] == "user"
+        if select_tool:
+            # Modify the question to force tool selection, for this request only
+            messages[-1] = {
+                "role": "user", 
+                "content": f"Select the best tool to handle this request: {last_message['content']}"
+            }
         
         # Send first request to Ollama
-        response = self._communicate_with_ollama(messages, "First Request")
-        
-        # Clean up the response for processing
-        cleaned_response = self.message_handler.clean_response_content(response)
+        try:
+            cleaned_response = self._communicate_with_ollama(messages, "First Request")
+        finally:
+            if select_tool:
+                messages[-1] = last_message
         
         # Check for tool calls in the response
         tool_calls = self.message_handler.parse_tool_calls(cleaned_response)
@@ -600,8 +737,8 @@ class ChatSession:
                 # Let the tool stack process the result
                 self.tool_stack.process_tool_result(tool_name, tool_result, success)
             
-            # Format results for display
-            tool_results_text = self.message_handler.format_tool_results(tool_results)
+            # Format results for the model; the debug tree renders them separately
+            tool_results_text = self.message_handler.format_tool_results_for_model(tool_results)
             
             # Check if we just got usage instructions
             got_usage_instructions = False
@@ -643,21 +780,10 @@ Tool results:
                 
                 self.history.append({"role": "system", "content": tool_context})
                 
-                # Get another response from the model to interpret the results
-                interpretation_messages = []
-                interpretation_messages.append({
-                    "role": "system", 
-                    "content": f"Use the {tool_results[0]['tool']} tool with the correct parameters to generate the code. Follow the usage instructions exactly."
-                })
-                #claude this area is the problem area
-                # Include the original user question directly
-                interpretation_messages.append({    "role": "user",    "content": question  })
-                # Add the tool context as a focused system message
-                interpretation_messages.append({    "role": "system",    "content": tool_context  })# This contains the usage instructions
-
-                interpretation_response = self._communicate_with_ollama(messages, "First Request")
-                
-                cleaned_interpretation = self.message_handler.clean_response_content(interpretation_response)
+                # Get another response from the model to interpret the results;
+                # the buffer only needs the entries just added to the history
+                messages = self._sync_messages_buffer(system_message)
+                cleaned_interpretation = self._communicate_with_ollama(messages, "Interpretation Request")
                 
                 # Add the interpretation to history
                 self.history.append({"role": "assistant", "content": cleaned_interpretation})
@@ -692,7 +818,13 @@ Tool results:
         print("DEBUG: Starting interactive session", file=sys.stderr)
         try:
             # Create prompt session with history
-            session = PromptSession(history=FileHistory(self.history_file))
+            # Tab completes slash commands, matched against the whole input so
+            # words later in a prompt are left alone
+            completer = WordCompleter(
+                lambda: self.command_handler.complete('/') + list(EXIT_COMMANDS),
+                sentence=True
+            )
+            session = PromptSession(history=FileHistory(self.history_file), completer=completer)
             print("DEBUG: PromptSession created", file=sys.stderr)
             
             # Display welcome message
@@ -715,7 +847,8 @@ Tool results:
                     user_input = session.prompt("\n[You]: ").strip()
                     
                     # Check for exit command
-                    if user_input.lower() in ['/bye', '/exit', '/quit', '/q']:
+                    # Only slash input can be an exit command, so don't lowercase whole messages
+                    if user_input[:1] == '/' and user_input.lower() in EXIT_COMMANDS:
                         break
                     
                     # Skip empty inputs
@@ -731,6 +864,10 @@ Tool results:
                     
                     # Print the response
                     console.print(f"\n[Assistant]: {response}")
+                    
+                    # Autosave in the background
+                    if save_path:
+                        self.save_history(save_path)
             except KeyboardInterrupt:
                 print("DEBUG: KeyboardInterrupt received", file=sys.stderr)
                 pass
@@ -738,7 +875,10 @@ Tool results:
                 # Save history if requested
                 if save_path:
                     self.save_history(save_path)
-                    display_system_message(f"Chat history saved to {save_path}")
+                    if self.commit_history():
+                        display_system_message(f"Chat history saved to {save_path}")
+                    else:
+                        display_system_message(f"Warning: chat history is still being written to {save_path} and may be incomplete")
                 
                 display_system_message("Chat session ended. Goodbye!")
                 print("DEBUG: Chat session ended", file=sys.stderr)
@@ -749,15 +889,109 @@ Tool results:
             raise
     
     def save_history(self, file_path: str):
-        """Save chat history to a file"""
-        with open(file_path, 'w') as f:
-            json.dump(self.history, f, indent=2)
+        """Queue a save of the chat history; the write happens on a background thread"""
+        with self._history_lock:
+            # History is append-only, so its length is enough of a snapshot
+            self._history_pending[file_path] = (self.history, len(self.history))
+        
+        thread = self._history_thread
+        if thread is not None and self._history_stop.is_set():
+            # A commit timed out and that writer is still shutting down; let it
+            # finish so two writers never append to the same file
+            thread.join()
+            thread = self._history_thread = None
+        
+        if thread is None:
+            self._history_stop.clear()
+            self._history_thread = threading.Thread(target=self._history_writer, daemon=True)
+            self._history_thread.start()
+        
+        self._history_queue.put(file_path)
+    
+    def commit_history(self, timeout: float = 5.0) -> bool:
+        """Flush queued history saves and stop the background writer; False if it is still writing"""
+        thread = self._history_thread
+        if thread is None:
+            return True
+        
+        if not self._history_stop.is_set():
+            self._history_stop.set()
+            self._history_queue.put(None)
+        thread.join(timeout)
+        if thread.is_alive():
+            return False
+        
+        self._history_thread = None
+        return True
+    
+    def _history_writer(self):
+        """Write queued history saves, coalescing bursts into a single write per file"""
+        while True:
+            file_path = self._history_queue.get()
+            if file_path is None:
+                return
+            
+            # Give further save requests a chance to arrive, unless we are shutting down
+            self._history_stop.wait(HISTORY_SAVE_DELAY)
+            
+            # Drain queued duplicates
+            paths = [file_path]
+            stopping = False
+            while True:
+                try:
+                    queued = self._history_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if queued is None:
+                    stopping = True
+                elif queued not in paths:
+                    paths.append(queued)
+            
+            for path in paths:
+                with self._history_lock:
+                    pending = self._history_pending.pop(path, None)
+                if pending is not None:
+                    self._write_history(path, *pending)
+            
+            if stopping:
+                return
+    
+    def _write_history(self, file_path: str, history: List[Dict[str, Any]], count: int):
+        """Write the first count history entries to a file as JSON lines"""
+        try:
+            saved = self._history_saved.get(file_path)
+            if saved and saved[0] is history and saved[1] <= count and os.path.exists(file_path):
+                # Only the entries added since the last save need writing
+                with open(file_path, 'a', encoding='utf-8') as f:
+                    f.write("".join(jsonio.dumps(entry) + "\n" for entry in history[saved[1]:count]))
+            else:
+                # New file or replaced history: rewrite it atomically
+                tmp_path = f"{file_path}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    f.write("".join(jsonio.dumps(entry) + "\n" for entry in history[:count]))
+                os.replace(tmp_path, file_path)
+            self._history_saved[file_path] = (history, count)
+        except Exception as e:
+            # An append may have stopped partway, so the next save rewrites the file
+            self._history_saved.pop(file_path, None)
+            console.print(f"[red]Error saving history: {str(e)}[/red]")
     
     def load_history(self, file_path: str):
         """Load chat history from a file"""
         try:
-            with open(file_path, 'r') as f:
-                self.history = json.load(f)
+            with open(file_path, 'rb') as f:
+                # History is saved as JSON lines; older versions wrote one JSON array
+                is_array = f.read(1) == b'['
+                f.seek(0)
+                if not is_array:
+                    self.history = [jsonio.loads(line) for line in f if line.strip()]
+                elif os.fstat(f.fileno()).st_size < HISTORY_MMAP_THRESHOLD:
+                    self.history = jsonio.loads(f.read())
+                else:
+                    # Parse large histories straight from the mapped bytes
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        with memoryview(mm) as view:
+                            self.history = jsonio.loads(view)
         except Exception as e:
             console.print(f"[red]Error loading history: {str(e)}[/red]")
     
@@ -769,7 +1003,10 @@ Tool results:
             if len(parts) >= 4:
                 tool_name = parts[2]
                 args = parts[3].split()
-                result = self.tool_registry.run_tool(tool_name, args)
-                return f"Tool {tool_name} result: {json.dumps(result, indent=2)}"
+                try:
+                    result = self.tool_registry.run_tool(tool_name, args)
+                    return f"Tool {tool_name} result: {jsonio.dumps(result, indent=True, default=str)}"
+                except Exception as e:
+                    return f"Error running tool {tool_name}: {str(e)}"
         
         return None
\ No newline at end of file
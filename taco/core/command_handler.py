@@ -3,49 +3,12 @@ TACO Command Handler
 Handles chat commands (e.g., /help, /status, /clear).
 Enhanced with project commands and simplified debug command.
 """
-from typing import Optional
+import sys
+from bisect import bisect_left
+from typing import Any, Dict, List
 
-class CommandHandler:
-    """Handles slash commands in the chat interface"""
-    
-    def __init__(self, chat_session):
-        """Initialize with reference to chat session"""
-        self.chat = chat_session
-    
-    def handle_command(self, command: str) -> str:
-        """Handle a chat command"""
-        cmd_parts = command.split()
-        cmd = cmd_parts[0].lower()
-        
-        if cmd == '/help':
-            return self._help_command()
-        elif cmd == '/status':
-            return self._status_command()
-        elif cmd == '/cancel':
-            return self._cancel_command()
-        elif cmd == '/debug':
-            return self._debug_command(cmd_parts)
-        elif cmd == '/model':
-            return self._model_command(cmd_parts)
-        elif cmd == '/clear':
-            return self._clear_command()
-        elif cmd == '/tools':
-            return self._tools_command()
-        elif cmd == '/context':
-            return self._context_command()
-        elif cmd == '/tool':
-            return self._tool_info_command(cmd_parts)
-        elif cmd == '/list':
-            return self._list_command(cmd_parts)
-        elif cmd == '/project':
-            # This will be handled by the enhanced chat session
-            return f"Project command should be handled by chat session"
-        else:
-            return f"Unknown command: {cmd}"
-    
-    def _help_command(self) -> str:
-        """Show help message"""
-        return """
+# Static help text, fully materialized for each debug mode
+_HELP_BODY = """
 Available commands:
 /help - Show this help message
 /bye - Exit the chat session (also: /exit, /quit)
@@ -65,24 +28,103 @@ Available commands:
   /project set <key> <value> - Set a project setting
   /project info - Show project information
 
-Debug mode: """ + ("ON" if self.chat.debug_mode else "OFF")
+Debug mode: """
+
+_HELP_WITH_DEBUG = {
+    False: _HELP_BODY + "OFF",
+    True: _HELP_BODY + "ON",
+}
+
+class CommandHandler:
+    """Handles slash commands in the chat interface"""
+    
+    __slots__ = ('chat', '_commands', '_command_names', '_command_names_source',
+                 '_tools_cache')
     
-    def _status_command(self) -> str:
+    def __init__(self, chat_session):
+        """Initialize with reference to chat session"""
+        self.chat = chat_session
+        # Dispatch table for this handler; replaced, never mutated, to add commands
+        self._commands = self._DISPATCH
+        # Sorted command names for prefix lookups, and the table they came from
+        self._command_names = []
+        self._command_names_source = None
+        # (registry version, tools) listing cache
+        self._tools_cache = (None, None)
+    
+    def _list_tools(self) -> List[Dict[str, Any]]:
+        """List registered tools, reusing the listing until the registry changes"""
+        registry = self.chat.tool_registry
+        if self._tools_cache[0] != registry.version:
+            self._tools_cache = (registry.version, registry.list_tools())
+        return self._tools_cache[1]
+    
+    def handle_command(self, command: str) -> str:
+        """Handle a chat command"""
+        # Only the command name is needed to dispatch; handlers split their own arguments
+        # Split on the first run of any whitespace, as str.split() does
+        parts = command.split(None, 1)
+        cmd = parts[0].lower() if parts else ''
+        args = parts[1] if len(parts) > 1 else ''
+        
+        handler = self._commands.get(cmd)
+        if handler is None:
+            # A bare '/' names no command, rather than prefixing all of them
+            if len(cmd) < 2:
+                return f"Unknown command: {cmd}"
+            
+            # Accept any unambiguous prefix, e.g. /hel for /help
+            matches = self._complete_lowered(cmd)
+            if len(matches) > 1:
+                return f"Ambiguous command: {cmd} (could be {', '.join(matches)})"
+            if not matches:
+                return f"Unknown command: {cmd}"
+            handler = self._commands[matches[0]]
+        return handler(self, args)
+    
+    def complete(self, prefix: str) -> List[str]:
+        """List the commands starting with prefix, in sorted order"""
+        return self._complete_lowered(prefix.lower())
+    
+    def _complete_lowered(self, prefix: str) -> List[str]:
+        """complete() for a prefix that is already lowercase"""
+        if self._command_names_source is not self._commands:
+            self._command_names = sorted(self._commands)
+            self._command_names_source = self._commands
+        
+        names = self._command_names
+        matches = []
+        i = bisect_left(names, prefix)
+        while i < len(names) and names[i].startswith(prefix):
+            matches.append(names[i])
+            i += 1
+        return matches
+    
+    def _project_command(self, args: str) -> str:
+        """Placeholder for /project, which the chat session handles"""
+        return f"Project command should be handled by chat session"
+    
+    def _help_command(self, args: str) -> str:
+        """Show help message"""
+        return _HELP_WITH_DEBUG[bool(self.chat.debug_mode)]
+    
+    def _status_command(self, args: str) -> str:
         """Show tool stack status"""
         return self.chat.tool_stack.format_stack()
     
-    def _cancel_command(self) -> str:
+    def _cancel_command(self, args: str) -> str:
         """Cancel current tool workflow"""
-        if self.chat.tool_stack.stack:
+        if self.chat.tool_stack.tools:
             self.chat.tool_stack.clear()
             return "Tool workflow cancelled."
         else:
             return "No active tool workflow to cancel."
     
-    def _debug_command(self, cmd_parts: list) -> str:
+    def _debug_command(self, args: str) -> str:
         """Turn debug mode on or off"""
-        if len(cmd_parts) > 1:
-            mode = cmd_parts[1].lower()
+        words = args.split()
+        if words:
+            mode = words[0].lower()
             if mode == 'on':
                 self.chat.debug_mode = True
                 return "Debug mode ON - you'll see detailed communication trees"
@@ -94,10 +136,11 @@ Debug mode: """ + ("ON" if self.chat.debug_mode else "OFF")
         else:
             return f"Debug mode is {'ON' if self.chat.debug_mode else 'OFF'}. Use /debug on or /debug off to change."
     
-    def _model_command(self, cmd_parts: list) -> str:
+    def _model_command(self, args: str) -> str:
         """Show or switch the current model"""
-        if len(cmd_parts) > 1:
-            model_name = cmd_parts[1]
+        words = args.split()
+        if words:
+            model_name = words[0]
             if self.chat.model_manager.set_default_model(model_name):
                 self.chat.model_name = model_name
                 return f"Switched to model: {model_name}"
@@ -106,21 +149,20 @@ Debug mode: """ + ("ON" if self.chat.debug_mode else "OFF")
         else:
             return f"Current model: {self.chat.model_name}"
     
-    def _clear_command(self) -> str:
+    def _clear_command(self, args: str) -> str:
         """Clear chat history and tool stack"""
         self.chat.history = []
         self.chat.tool_stack.clear()
         return "Chat history and tool stack cleared"
     
-    def _tools_command(self) -> str:
+    def _tools_command(self, args: str) -> str:
         """List available tools"""
-        tools = self.chat.tool_registry.list_tools()
-        result = "Available tools:\n"
-        for tool in tools:
-            result += f"• {tool['name']}\n"
-        return result
+        tools = self._list_tools()
+        parts = ["Available tools:\n"]
+        parts.extend(f"• {tool['name']}\n" for tool in tools)
+        return "".join(parts)
     
-    def _context_command(self) -> str:
+    def _context_command(self, args: str) -> str:
         """Show active context"""
         active = self.chat.context_manager.get_active_context()
         if active:
@@ -128,56 +170,75 @@ Debug mode: """ + ("ON" if self.chat.debug_mode else "OFF")
         else:
             return "No active context"
     
-    def _tool_info_command(self, cmd_parts: list) -> str:
+    def _tool_info_command(self, args: str) -> str:
         """Show detailed information about a specific tool"""
-        if len(cmd_parts) < 2:
+        words = args.split()
+        if not words:
             return "Usage: /tool <tool_name>"
         
-        tool_name = cmd_parts[1]
+        tool_name = words[0]
         tool_info = self.chat.tool_registry.get_tool_info(tool_name)
         
         if tool_info:
-            result = f"Tool: {tool_info['name']}\n"
-            result += f"Description: {tool_info['description']}\n\n"
-            result += "Parameters:\n"
+            parts = [
+                f"Tool: {tool_info['name']}\n",
+                f"Description: {tool_info['description']}\n\n",
+                "Parameters:\n"
+            ]
             for param in tool_info['parameters']:
                 required_str = " (required)" if param.get('required', False) else ""
-                result += f"• {param['name']} ({param['type']}){required_str} - {param['description']}\n"
+                parts.append(f"• {param['name']} ({param['type']}){required_str} - {param['description']}\n")
             
             # Add usage instructions if available
             if tool_info.get('usage_instructions'):
-                result += f"\nUsage Instructions:\n{tool_info['usage_instructions']}"
+                parts.append(f"\nUsage Instructions:\n{tool_info['usage_instructions']}")
             
-            return result
+            return "".join(parts)
         else:
             return f"Error: Tool '{tool_name}' not found"
     
-    def _list_command(self, cmd_parts: list) -> str:
+    def _list_command(self, args: str) -> str:
         """List models or tools"""
-        if len(cmd_parts) < 2:
+        words = args.split()
+        if not words:
             return "Please specify what to list. Options: 'model' or 'tools'"
         
-        list_type = cmd_parts[1].lower()
+        list_type = words[0].lower()
         
         if list_type == 'model':
+            # The model manager caches the listing itself
             models = self.chat.model_manager.list_models()
             if not models:
                 return "No models found. Make sure Ollama is running."
             
-            result = "Available Ollama models:\n"
-            for model in models:
-                result += f"• {model['name']} - {model['description']}\n"
-            return result
+            parts = ["Available Ollama models:\n"]
+            parts.extend(f"• {model['name']} - {model['description']}\n" for model in models)
+            return "".join(parts)
         
         elif list_type == 'tools':
-            tools = self.chat.tool_registry.list_tools()
+            tools = self._list_tools()
             if not tools:
                 return "No tools registered."
             
-            result = "Registered TACO tools:\n"
-            for tool in tools:
-                result += f"• {tool['name']} - {tool['description']}\n"
-            return result
+            parts = ["Registered TACO tools:\n"]
+            parts.extend(f"• {tool['name']} - {tool['description']}\n" for tool in tools)
+            return "".join(parts)
         
         else:
-            return f"Unknown list type: {list_type}. Options are: 'model' or 'tools'"
\ No newline at end of file
+            return f"Unknown list type: {list_type}. Options are: 'model' or 'tools'"
+    
+    # Command name -> handler; every handler takes the argument string
+    # Keys are interned so lookups can match on identity first
+    _DISPATCH = {sys.intern(name): handler for name, handler in {
+        '/help': _help_command,
+        '/status': _status_command,
+        '/cancel': _cancel_command,
+        '/debug': _debug_command,
+        '/model': _model_command,
+        '/clear': _clear_command,
+        '/tools': _tools_command,
+        '/context': _context_command,
+        '/tool': _tool_info_command,
+        '/list': _list_command,
+        '/project': _project_command,
+    }.items()}
@@ -2,8 +2,10 @@
 TACO Configuration Management
 """
 import os
-import json
-from typing import Dict, Any, Optional
+import copy
+from typing import Dict, Any, Optional, Tuple
+
+from taco.utils import jsonio
 
 # Default configuration
 DEFAULT_CONFIG = {
@@ -28,43 +30,67 @@ DEFAULT_CONFIG = {
     }
 }
 
+# Last parsed config with the file mtime it was read at: (mtime_ns, config)
+_config_cache: Optional[Tuple[int, Dict[str, Any]]] = None
+
+# Resolved config file path; the directory is created once per process
+_config_path: Optional[str] = None
+
 def get_config_path() -> str:
     """Get the path to the config file"""
-    config_dir = os.path.expanduser("~/.config/taco")
-    os.makedirs(config_dir, exist_ok=True)
-    return os.path.join(config_dir, "config.json")
+    global _config_path
+    if _config_path is None:
+        config_dir = os.path.expanduser("~/.config/taco")
+        os.makedirs(config_dir, exist_ok=True)
+        _config_path = os.path.join(config_dir, "config.json")
+    return _config_path
+
+def _write_config(config_path: str, config: Dict[str, Any]):
+    """Atomically replace the config file, serializing before it is opened"""
+    data = jsonio.dumps(config, indent=True)
+    tmp_path = config_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(data)
+    os.replace(tmp_path, config_path)
 
 def get_config() -> Dict[str, Any]:
     """Load the configuration file"""
+    global _config_cache
     config_path = get_config_path()
     
     # If config doesn't exist, create default
     if not os.path.exists(config_path):
-        with open(config_path, 'w') as f:
-            json.dump(DEFAULT_CONFIG, f, indent=2)
-        return DEFAULT_CONFIG
+        _write_config(config_path, DEFAULT_CONFIG)
+        return copy.deepcopy(DEFAULT_CONFIG)
     
-    # Load config
+    # Load config, reusing the last parse while the file is unchanged.
+    # Callers get their own copy since several modify and save it.
     try:
-        with open(config_path, 'r') as f:
-            config = json.load(f)
+        mtime = os.stat(config_path).st_mtime_ns
+        if _config_cache is not None and _config_cache[0] == mtime:
+            return copy.deepcopy(_config_cache[1])
+        
+        with open(config_path, 'rb') as f:
+            config = jsonio.loads(f.read())
         
         # Ensure all default sections exist
         for section, values in DEFAULT_CONFIG.items():
             if section not in config:
                 config[section] = values
         
-        return config
+        _config_cache = (mtime, config)
+        return copy.deepcopy(config)
     except Exception:
         return DEFAULT_CONFIG
 
 def save_config(config: Dict[str, Any]) -> bool:
     """Save the configuration to file"""
+    global _config_cache
     config_path = get_config_path()
     
     try:
-        with open(config_path, 'w') as f:
-            json.dump(config, f, indent=2)
+        _write_config(config_path, config)
+        _config_cache = (os.stat(config_path).st_mtime_ns, copy.deepcopy(config))
         return True
     except Exception:
         return False
@@ -76,17 +102,23 @@ def set_config_value(key_path: str, value: Any) -> bool:
     # Split the key path
     parts = key_path.split('.')
     
-    if len(parts) != 2:
+    # Keys live inside a section, so at least two non-empty segments are needed
+    if len(parts) < 2 or not all(parts):
         return False
     
-    section, key = parts
+    # Walk down to the parent of the key, creating sections as needed
+    section = config
+    for part in parts[:-1]:
+        section = section.setdefault(part, {})
+        if not isinstance(section, dict):
+            return False
     
-    # Check if section exists
-    if section not in config:
-        config[section] = {}
+    # Refuse to replace a whole section with a scalar
+    if isinstance(section.get(parts[-1]), dict) and not isinstance(value, dict):
+        return False
     
     # Set the value
-    config[section][key] = value
+    section[parts[-1]] = value
     
     # Save the config
-    return save_config(config)
\ No newline at end of file
+    return save_config(config)
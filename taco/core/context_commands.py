@@ -3,10 +3,11 @@ TACO Context Project Commands
 Handles project-related context commands
 """
 from typing import List
-from taco.context.enhanced_engine import get_enhanced_context_manager
 
 def handle_context_project_command(command: str, args: List[str]) -> str:
     """Handle project-related context commands"""
+    # Imported here so loading this module doesn't pull in the context engine
+    from taco.context.enhanced_engine import get_enhanced_context_manager
     context_manager = get_enhanced_context_manager()
     
     if command == '/project':
@@ -14,14 +15,15 @@ def handle_context_project_command(command: str, args: List[str]) -> str:
             # Show current project info
             project_info = context_manager.get_project_info()
             if project_info:
-                result = f"Current project: {project_info['name']}\n"
-                result += f"Working directory: {project_info['workingdir']}\n"
-                result += f"Language: {project_info['language']}\n"
+                parts = [
+                    f"Current project: {project_info['name']}\n",
+                    f"Working directory: {project_info['workingdir']}\n",
+                    f"Language: {project_info['language']}\n"
+                ]
                 if project_info['defaults']:
-                    result += "\nProject defaults:\n"
-                    for key, value in project_info['defaults'].items():
-                        result += f"  {key}: {value}\n"
-                return result
+                    parts.append("\nProject defaults:\n")
+                    parts.extend(f"  {key}: {value}\n" for key, value in project_info['defaults'].items())
+                return "".join(parts)
             else:
                 return "No active project. Use '/project new <name>' to create one."
         
@@ -57,8 +59,7 @@ def handle_context_project_command(command: str, args: List[str]) -> str:
             context_name = f"project_{project_name}"
             
             # Check if project exists
-            contexts = context_manager.list_contexts()
-            if not any(ctx['name'] == context_name for ctx in contexts):
+            if not context_manager.has_context(context_name):
                 return f"Project '{project_name}' not found"
             
             success = context_manager.set_active_context(context_name)
@@ -97,15 +98,8 @@ def handle_context_project_command(command: str, args: List[str]) -> str:
 # Add these commands to the chat command handler
 def add_project_commands(command_handler):
     """Add project commands to the command handler"""
-    original_handle = command_handler.handle_command
-    
-    def enhanced_handle_command(command: str) -> str:
-        # Check for project commands first
-        if command.startswith('/project'):
-            parts = command.split()
-            return handle_context_project_command(parts[0], parts[1:])
-        
-        # Fall back to original handler
-        return original_handle(command)
-    
-    command_handler.handle_command = enhanced_handle_command
\ No newline at end of file
+    # Per-handler copy of the dispatch table, so the class table stays untouched
+    command_handler._commands = {
+        **command_handler._commands,
+        '/project': lambda _, args: handle_context_project_command('/project', args.split())
+    }
\ No newline at end of file
@@ -2,112 +2,200 @@
 TACO Debug Display
 Handles debug visualization and formatting.
 """
+import json
 from typing import List, Dict, Any, Optional
-from rich.console import Console
-from rich.tree import Tree
-from rich.panel import Panel
 
-console = Console()
+# Rich is only needed once a debug tree is shown, so it is imported on first use
+console = None
+Tree = None
+Panel = None
+
+# Panel border styles by colour name, parsed when Rich is loaded
+_STYLES: Dict[str, Any] = {}
+
+def _load_rich():
+    """Import Rich and parse the panel border styles on first use"""
+    global console, Tree, Panel
+    if console is not None:
+        return
+    
+    from rich.console import Console
+    from rich.tree import Tree as RichTree
+    from rich.panel import Panel as RichPanel
+    from rich.style import Style
+    
+    for color in ("blue", "magenta", "green", "yellow", "cyan", "red", "white"):
+        _STYLES[color] = Style.parse(color)
+    Tree = RichTree
+    Panel = RichPanel
+    console = Console()
+
+# Tool calls rendered in full per response; the rest are summarized
+MAX_TOOL_CALL_NODES = 10
+
+def _call_key(tool_name: str, parameters: Any) -> tuple:
+    """Hashable key identifying a tool call by name and parameters"""
+    return (tool_name, json.dumps(parameters, sort_keys=True, default=str))
 
 class DebugDisplay:
     """Handles debug visualization for chat sessions"""
     
+    __slots__ = ('message_handler', '_message_cache')
+    
     def __init__(self, message_handler):
         """Initialize with reference to message handler"""
         self.message_handler = message_handler
+        # Formatted history messages from the previous tree, keyed by id.
+        # History entries are never mutated once appended, so their text
+        # can be reused from turn to turn.
+        self._message_cache = {}
     
     def display_debug_tree(self, user_input: str, messages: List[Dict], 
                           response: str, tool_calls: List[Dict], 
                           tool_results: List[Dict], tool_stack: Any,
                           follow_up_data: Optional[Dict] = None):
         """Display debug information as a tree"""
+        _load_rich()
+        
+        # Formatted JSON for objects already rendered in this tree, keyed by id.
+        # The object is kept alongside its text so its id can't be reused.
+        formatted_cache = {}
+        
+        def format_json(data: Any) -> str:
+            cached = formatted_cache.get(id(data))
+            if cached is None:
+                cached = (data, self.message_handler.format_json_for_display(data))
+                formatted_cache[id(data)] = cached
+            return cached[1]
+        
+        def format_call(call: Dict) -> str:
+            # Keyed on the parsed call itself, since the name/parameters view is rebuilt each time
+            cached = formatted_cache.get(id(call))
+            if cached is None:
+                call_data = {
+                    "name": call['tool_name'],
+                    "parameters": call['parameters']
+                }
+                cached = (call, self.message_handler.format_json_for_display(call_data))
+                formatted_cache[id(call)] = cached
+            return cached[1]
+        
+        # Messages formatted for this tree; replaces the cache afterwards so
+        # entries that dropped out of the history are released
+        message_cache = {}
+        
+        def format_messages(messages: List[Dict]) -> str:
+            if not messages:
+                return "[]"
+            parts = ["["]
+            for message in messages:
+                cached = message_cache.get(id(message)) or self._message_cache.get(id(message))
+                if cached is None:
+                    cached = (message, self.message_handler.format_json_for_display(message, 1))
+                message_cache[id(message)] = cached
+                parts.append("\n  ")
+                parts.append(cached[1])
+                parts.append(",")
+            parts[-1] = "\n]"
+            return "".join(parts)
+        
         tree = Tree("🔍 Debug Communication Tree")
         
         # User input
         user_node = tree.add("👤 User Input")
-        user_node.add(Panel(user_input, title="Question", border_style="blue"))
+        user_node.add(Panel(user_input, title="Question", border_style=_STYLES["blue"]))
         
         # Tool stack status
-        if tool_stack.stack:
+        if tool_stack.tools:
             stack_node = tree.add("📚 Tool Stack")
-            stack_node.add(Panel(tool_stack.format_stack(), title="Current Stack", border_style="magenta"))
+            stack_node.add(Panel(tool_stack.format_stack(), title="Current Stack", border_style=_STYLES["magenta"]))
         
         # First Request to Ollama
         request_node = tree.add("📤 Request to Ollama")
         # Format the messages for display using custom formatter
-        formatted_request = self.message_handler.format_json_for_display(messages)
+        formatted_request = format_messages(messages)
         request_node.add(Panel(formatted_request, 
-                              title="JSON Request", border_style="green"))
+                              title="JSON Request", border_style=_STYLES["green"]))
         
         # First Response from Ollama
         response_node = tree.add("📥 Response from Ollama")
-        formatted_response = self.message_handler.format_for_panel(response)
-        response_node.add(Panel(formatted_response, title="Raw Response", border_style="yellow"))
+        formatted_response = self.message_handler.format_for_panel(response, already_cleaned=True)
+        response_node.add(Panel(formatted_response, title="Raw Response", border_style=_STYLES["yellow"]))
+        
+        # Plain chat turn: the exchange above is all there is to show, so skip
+        # the tool subtree and the final-output placeholder
+        if not tool_calls and not follow_up_data:
+            self._message_cache = message_cache
+            console.print(tree)
+            return
         
         if tool_calls:
             # Tool calls found
             tools_node = response_node.add("🔧 Tool Calls Detected")
-            for i, call in enumerate(tool_calls):
+            
+            # Index results by call so each tool call finds its result directly
+            result_index = {}
+            for result in tool_results:
+                result_index.setdefault(_call_key(result['tool'], result['parameters']), result)
+            
+            for i, call in enumerate(tool_calls[:MAX_TOOL_CALL_NODES]):
                 tool_node = tools_node.add(f"Tool {i+1}: {call['tool_name']}")
                 # Use custom formatter for tool calls too
-                call_data = {
-                    "name": call['tool_name'],
-                    "parameters": call['parameters']
-                }
-                formatted_call = self.message_handler.format_json_for_display(call_data)
+                formatted_call = format_call(call)
                 tool_node.add(Panel(formatted_call, 
-                                   title="Tool Call", border_style="cyan"))
+                                   title="Tool Call", border_style=_STYLES["cyan"]))
                 
                 # Find corresponding result
-                matching_result = None
-                for result in tool_results:
-                    if result['tool'] == call['tool_name'] and result['parameters'] == call['parameters']:
-                        matching_result = result
-                        break
+                matching_result = result_index.get(_call_key(call['tool_name'], call['parameters']))
                 
                 if matching_result:
                     result_node = tool_node.add("📊 Tool Result")
                     if matching_result['success']:
                         # Use custom formatting for better display
-                        formatted_json = self.message_handler.format_json_for_display(matching_result['result'])
+                        formatted_json = format_json(matching_result['result'])
                         result_node.add(Panel(formatted_json, 
-                                            title="Success", border_style="green"))
+                                            title="Success", border_style=_STYLES["green"]))
                     else:
                         result_node.add(Panel(matching_result['error'], 
-                                            title="Error", border_style="red"))
+                                            title="Error", border_style=_STYLES["red"]))
+            
+            if len(tool_calls) > MAX_TOOL_CALL_NODES:
+                tools_node.add(f"... (+{len(tool_calls) - MAX_TOOL_CALL_NODES} more)")
         
         # Add second request/response if available
         if follow_up_data:
             # Second Request to Ollama
             if 'messages' in follow_up_data:
                 second_request_node = tree.add("📤 Second Request to Ollama")
-                formatted_second_request = self.message_handler.format_json_for_display(follow_up_data['messages'])
+                formatted_second_request = format_messages(follow_up_data['messages'])
                 second_request_node.add(Panel(formatted_second_request, 
-                                            title="Second JSON Request", border_style="green"))
+                                            title="Second JSON Request", border_style=_STYLES["green"]))
             
             # Second Response from Ollama
             if 'response' in follow_up_data:
                 second_response_node = tree.add("📥 Second Response from Ollama")
-                formatted_second_response = self.message_handler.format_for_panel(follow_up_data['response'])
+                formatted_second_response = self.message_handler.format_for_panel(
+                    follow_up_data['response'], already_cleaned=True)
                 second_response_node.add(Panel(formatted_second_response, 
-                                             title="Second Raw Response", border_style="yellow"))
+                                             title="Second Raw Response", border_style=_STYLES["yellow"]))
                 
                 # Check for tool calls in second response
                 if 'tool_calls' in follow_up_data and follow_up_data['tool_calls']:
                     second_tool_calls = follow_up_data['tool_calls']
                     second_tools_node = second_response_node.add("🔧 Tool Calls in Second Response")
-                    for i, call in enumerate(second_tool_calls):
+                    for i, call in enumerate(second_tool_calls[:MAX_TOOL_CALL_NODES]):
                         second_tool_node = second_tools_node.add(f"Tool {i+1}: {call['tool_name']}")
-                        call_data = {
-                            "name": call['tool_name'],
-                            "parameters": call['parameters']
-                        }
-                        formatted_call = self.message_handler.format_json_for_display(call_data)
+                        formatted_call = format_call(call)
                         second_tool_node.add(Panel(formatted_call, 
-                                                 title="Tool Call", border_style="cyan"))
+                                                 title="Tool Call", border_style=_STYLES["cyan"]))
+                    
+                    if len(second_tool_calls) > MAX_TOOL_CALL_NODES:
+                        second_tools_node.add(f"... (+{len(second_tool_calls) - MAX_TOOL_CALL_NODES} more)")
         
         # Final output to user
         output_node = tree.add("💬 Final Output to User")
-        output_node.add(Panel("(Shown in main chat)", border_style="white"))
+        output_node.add(Panel("(Shown in main chat)", border_style=_STYLES["white"]))
+        
+        self._message_cache = message_cache
         
         console.print(tree)
\ No newline at end of file
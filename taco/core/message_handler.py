@@ -2,183 +2,265 @@
 TACO Message Handler
 Handles parsing, cleaning, and formatting of messages and tool calls.
 """
+import codecs
 import json
 import re
+import sys
+import textwrap
+from functools import lru_cache
 from typing import Any, Dict, List
 
+from taco.utils import jsonio
+
+# Fences around JSON blocks that may contain tool calls
+_JSON_FENCE_OPEN = '```json'
+_FENCE = '```'
+
+# Decodes JSON in place from an offset, so blocks are never copied out first
+_DECODER = json.JSONDecoder()
+_WHITESPACE_RE = re.compile(r'\s*')
+
+# Content field of a stringified ollama Message object
+_MODEL_CONTENT_RE = re.compile(r'content=(["\'])(.*?)\1(?:,\s*images=|$)', re.DOTALL)
+
+# Bound once rather than looked up through the codec registry on every call
+_UNICODE_ESCAPE_DECODE = codecs.getdecoder('unicode_escape')
+
+# Turns the '?' placeholders left by an ASCII 'replace' encode into spaces
+_QUESTION_TO_SPACE = bytes.maketrans(b'?', b' ')
+
+# Longest response string whose cleaned form is cached
+CLEAN_CACHE_MAX_CHARS = 64 * 1024
+
+# Panel line wrappers by width, reused instead of building one per wrapped line
+_WRAPPERS: Dict[int, textwrap.TextWrapper] = {}
+
+def _maybe_unescape(text: str) -> str:
+    """Decode backslash escape sequences, returning text without any unchanged"""
+    if '\\' not in text:
+        return text
+    try:
+        # backslashreplace carries non-Latin-1 characters through the codec intact
+        return _UNICODE_ESCAPE_DECODE(text.encode('latin-1', 'backslashreplace'))[0]
+    except UnicodeDecodeError:
+        return text
+
+def _copy_tool_calls(tool_calls: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Copy parsed tool calls and their parameters, since callers rewrite parameters in place"""
+    return [
+        {**call, 'parameters': dict(call['parameters'])} if isinstance(call['parameters'], dict) else dict(call)
+        for call in tool_calls
+    ]
+
+def _format_result_for_model(result: Any) -> str:
+    """Render a tool result for the model as JSON, keeping multi-line text verbatim"""
+    if isinstance(result, str):
+        return result
+    if not isinstance(result, dict):
+        return jsonio.dumps(result, indent=True, default=str)
+    
+    # Multi-line strings such as usage instructions would become one escaped
+    # line inside the JSON, so they follow it as plain text instead
+    texts = {key: value for key, value in result.items()
+             if isinstance(value, str) and '\n' in value}
+    if not texts:
+        return jsonio.dumps(result, indent=True, default=str)
+    
+    data = {key: value for key, value in result.items() if key not in texts}
+    parts = [jsonio.dumps(data, indent=True, default=str)]
+    parts.extend(f"\n{key}:\n{value}" for key, value in texts.items())
+    return "\n".join(parts)
+
 class MessageHandler:
     """Handles message processing, parsing, and formatting"""
     
+    # Unicode replacements for common problematic characters
+    unicode_replacements = {
+        '\u2018': "'",  # Left single quotation mark
+        '\u2019': "'",  # Right single quotation mark
+        '\u201c': '"',  # Left double quotation mark
+        '\u201d': '"',  # Right double quotation mark
+        '\u2013': '-',  # En dash
+        '\u2014': '--', # Em dash
+        '\u2026': '...', # Horizontal ellipsis
+        '\u00a0': ' ',  # Non-breaking space
+        '\u2022': '*',  # Bullet
+        '\u25cf': '*',  # Black circle
+        '\u2122': '(TM)', # Trademark
+        '\u00ae': '(R)', # Registered trademark
+        '\u00a9': '(C)', # Copyright
+        '\u00b0': ' degrees', # Degree symbol
+        '\u00b1': '+/-', # Plus-minus
+        '\u00bc': '1/4', # One quarter
+        '\u00bd': '1/2', # One half
+        '\u00be': '3/4', # Three quarters
+        '\u2190': '<-',  # Left arrow
+        '\u2192': '->',  # Right arrow
+        '\u2194': '<->', # Left-right arrow
+        '\u2713': 'checkmark', # Check mark
+        '\u2717': 'X',   # Ballot X
+        '\u221e': 'infinity', # Infinity
+        '\u2260': '!=',  # Not equal
+        '\u2264': '<=',  # Less than or equal
+        '\u2265': '>=',  # Greater than or equal
+        '\u2248': '~=',  # Almost equal
+    }
+    
+    # str.translate accepts multi-character replacements too, so one table
+    # applies every replacement in a single pass; built once at class load
+    _translate_table = str.maketrans(unicode_replacements)
+    
     def __init__(self):
         """Initialize the message handler"""
-        # Unicode replacements for common problematic characters
-        self.unicode_replacements = {
-            '\u2018': "'",  # Left single quotation mark
-            '\u2019': "'",  # Right single quotation mark
-            '\u201c': '"',  # Left double quotation mark
-            '\u201d': '"',  # Right double quotation mark
-            '\u2013': '-',  # En dash
-            '\u2014': '--', # Em dash
-            '\u2026': '...', # Horizontal ellipsis
-            '\u00a0': ' ',  # Non-breaking space
-            '\u2022': '*',  # Bullet
-            '\u25cf': '*',  # Black circle
-            '\u2122': '(TM)', # Trademark
-            '\u00ae': '(R)', # Registered trademark
-            '\u00a9': '(C)', # Copyright
-            '\u00b0': ' degrees', # Degree symbol
-            '\u00b1': '+/-', # Plus-minus
-            '\u00bc': '1/4', # One quarter
-            '\u00bd': '1/2', # One half
-            '\u00be': '3/4', # Three quarters
-            '\u2190': '<-',  # Left arrow
-            '\u2192': '->',  # Right arrow
-            '\u2194': '<->', # Left-right arrow
-            '\u2713': 'checkmark', # Check mark
-            '\u2717': 'X',   # Ballot X
-            '\u221e': 'infinity', # Infinity
-            '\u2260': '!=',  # Not equal
-            '\u2264': '<=',  # Less than or equal
-            '\u2265': '>=',  # Greater than or equal
-            '\u2248': '~=',  # Almost equal
-        }
+        # Last (response, tool calls) parsed; a response is parsed once for
+        # debug logging and again by the caller
+        self._last_parse = (None, [])
     
     def parse_tool_calls(self, response: str) -> List[Dict[str, Any]]:
         """Extract tool calls from the model's response"""
-        tool_calls = []
+        # Most replies contain no tool call at all
+        if _JSON_FENCE_OPEN not in response:
+            return []
+        
+        last_response, last_calls = self._last_parse
+        if response is last_response:
+            return _copy_tool_calls(last_calls)
         
-        # Find all JSON blocks
-        json_pattern = r'```json\s*(.*?)\s*```'
-        matches = re.finditer(json_pattern, response, re.DOTALL)
+        tool_calls = []
+        append = tool_calls.append
+        raw_decode = _DECODER.raw_decode
+        skip_whitespace = _WHITESPACE_RE.match
         
-        for match in matches:
+        # Find each JSON block's opening fence and decode straight from the response
+        pos = 0
+        while True:
+            start = response.find(_JSON_FENCE_OPEN, pos)
+            if start < 0:
+                break
+            body_start = skip_whitespace(response, start + len(_JSON_FENCE_OPEN)).end()
             try:
-                json_content = match.group(1).strip()
-                data = json.loads(json_content)
-                
-                if 'tool_call' in data:
-                    tool_call = data['tool_call']
-                    if 'name' in tool_call and 'parameters' in tool_call:
-                        tool_calls.append({
-                            'tool_name': tool_call['name'],
-                            'parameters': tool_call['parameters'],
-                            'original_text': match.group(0)
-                        })
+                data, body_end = raw_decode(response, body_start)
             except json.JSONDecodeError:
-                # Skip invalid JSON
+                data, body_end = None, body_start
+            
+            end = response.find(_FENCE, body_end)
+            if end < 0:
+                break
+            pos = end + len(_FENCE)
+            
+            # Skip invalid JSON, including anything but whitespace before the closing fence
+            if data is None or skip_whitespace(response, body_end).end() != end:
                 continue
+            
+            if not isinstance(data, dict) or 'tool_call' not in data:
+                continue
+            
+            tool_call = data['tool_call']
+            if isinstance(tool_call, dict) and 'name' in tool_call and 'parameters' in tool_call:
+                append({
+                    # Interned to match the registry's tool name keys by identity
+                    'tool_name': sys.intern(tool_call['name']) if isinstance(tool_call['name'], str) else tool_call['name'],
+                    'parameters': tool_call['parameters'],
+                    'original_text': response[start:pos],
+                    'span': (start, pos)
+                })
         
-        return tool_calls
+        self._last_parse = (response, tool_calls)
+        return _copy_tool_calls(tool_calls)
     
     def clean_response_content(self, content: str) -> str:
         """Clean up response content for display"""
-        # Handle the Message object format
-        if isinstance(content, str) and content.startswith("model=") and "message=Message(" in content:
-            # Look for content with single or double quotes
-            match = re.search(r'content=(["\'])(.*?)\1(?:,\s*images=|$)', content, re.DOTALL)
-            if match:
-                actual_content = match.group(2)
-                content = actual_content.strip()
-        
-        # For all string content, fix Unicode issues
-        if isinstance(content, str):
-            # Apply all replacements
-            for unicode_char, replacement in self.unicode_replacements.items():
-                content = content.replace(unicode_char, replacement)
-            
-            # Try to decode any remaining escape sequences
-            try:
-                if '\\n' in content or '\\u' in content or '\\x' in content:
-                    content = content.encode('utf-8').decode('unicode-escape')
-            except Exception:
-                # If decoding fails, just continue with what we have
-                pass
-            
-            # Final cleanup - remove any remaining non-ASCII characters
-            # that might cause display issues
-            try:
-                # Try to encode to ASCII and replace problematic characters
-                content = content.encode('ascii', errors='replace').decode('ascii')
-                # Replace the placeholder character with a space
-                content = content.replace('?', ' ')
-            except Exception:
-                # If even this fails, just return the content as is
-                pass
-        
-        return content
+        if not isinstance(content, str):
+            return content
+        # The same text is often cleaned more than once; very large strings
+        # are cleaned directly so they don't pin memory in the cache
+        if len(content) > CLEAN_CACHE_MAX_CHARS:
+            return _clean_content(content)
+        return _clean_content_cached(content)
     
     def format_json_for_display(self, data: Any, indent: int = 0) -> str:
         """Format JSON data with properly rendered strings for display"""
+        out: List[str] = []
+        self._write_json_for_display(data, indent, out)
+        return "".join(out)
+    
+    def _write_json_for_display(self, data: Any, indent: int, out: List[str]) -> None:
+        """Append the display form of data to out, sharing one buffer across nesting levels"""
         spaces = "  " * indent
+        append = out.append
         if isinstance(data, dict):
-            lines = ["{"]
-            items = list(data.items())
-            for i, (key, value) in enumerate(items):
-                comma = "," if i < len(items) - 1 else ""
+            append("{")
+            # Each entry after the first closes the previous one with a comma
+            sep = ""
+            for key, value in data.items():
+                append(sep)
+                sep = ","
                 if isinstance(value, str):
-                    # Format string values with actual newlines
-                    formatted_value = value.encode().decode('unicode-escape')
+                    # Format string values with actual newlines; most carry no
+                    # escapes, so skip even the helper call for those
+                    formatted_value = value if '\\' not in value else _maybe_unescape(value)
                     # Add quotes and handle multiline strings
                     if '\n' in formatted_value:
-                        lines.append(f'{spaces}  "{key}": """')
-                        for line in formatted_value.split('\n'):
-                            lines.append(f'{spaces}    {line}')
-                        lines.append(f'{spaces}  """{comma}')
+                        line_sep = f'\n{spaces}    '
+                        append(f'\n{spaces}  "{key}": """{line_sep}')
+                        append(line_sep.join(formatted_value.split('\n')))
+                        append(f'\n{spaces}  """')
                     else:
-                        lines.append(f'{spaces}  "{key}": "{formatted_value}"{comma}')
+                        append(f'\n{spaces}  "{key}": "{formatted_value}"')
                 else:
                     # Recursively format nested structures
-                    formatted_value = self.format_json_for_display(value, indent + 1)
-                    lines.append(f'{spaces}  "{key}": {formatted_value}{comma}')
-            lines.append(f"{spaces}}}")
-            return "\n".join(lines)
+                    append(f'\n{spaces}  "{key}": ')
+                    self._write_json_for_display(value, indent + 1, out)
+            append(f"\n{spaces}}}")
         elif isinstance(data, list):
             if not data:
-                return "[]"
-            lines = ["["]
-            for i, item in enumerate(data):
-                comma = "," if i < len(data) - 1 else ""
-                formatted_item = self.format_json_for_display(item, indent + 1)
-                lines.append(f"{spaces}  {formatted_item}{comma}")
-            lines.append(f"{spaces}]")
-            return "\n".join(lines)
+                append("[]")
+                return
+            item_sep = f"\n{spaces}  "
+            append("[")
+            sep = item_sep
+            for item in data:
+                append(sep)
+                sep = "," + item_sep
+                self._write_json_for_display(item, indent + 1, out)
+            append(f"\n{spaces}]")
         elif isinstance(data, str):
             # For standalone strings, decode escape sequences
-            return f'"{data.encode().decode("unicode-escape")}"'
+            append(f'"{data}"' if '\\' not in data else f'"{_maybe_unescape(data)}"')
         elif isinstance(data, (int, float, bool)) or data is None:
-            return json.dumps(data)
+            append(json.dumps(data))
         else:
-            return str(data)
+            append(str(data))
     
-    def format_for_panel(self, content: str, max_width: int = 80) -> str:
+    def format_for_panel(self, content: str, max_width: int = 80,
+                         already_cleaned: bool = False) -> str:
         """Format content for display in a panel with proper line wrapping"""
-        # Clean up the content first
-        cleaned = self.clean_response_content(content)
+        # Clean up the content first unless the caller already did
+        cleaned = content if already_cleaned else self.clean_response_content(content)
         
         # If it's JSON, format it nicely
-        if cleaned.strip().startswith('{') or cleaned.strip().startswith('['):
+        if cleaned.lstrip()[:1] in ('{', '['):
+            # JSON that is already indented is shown as is
+            if '\n  ' in cleaned[:256]:
+                return cleaned
             try:
-                parsed = json.loads(cleaned)
-                return json.dumps(parsed, indent=2)
+                parsed = jsonio.loads(cleaned)
+                return jsonio.dumps(parsed, indent=True)
             except:
                 pass
         
         # For regular text, ensure proper line breaks
         lines = []
+        wrapper = None
         for line in cleaned.split('\n'):
             if len(line) > max_width:
-                # Wrap long lines
-                words = line.split()
-                current_line = ""
-                for word in words:
-                    if len(current_line) + len(word) + 1 <= max_width:
-                        current_line += word + " "
-                    else:
-                        if current_line:
-                            lines.append(current_line.strip())
-                        current_line = word + " "
-                if current_line:
-                    lines.append(current_line.strip())
+                if wrapper is None:
+                    wrapper = _WRAPPERS.get(max_width)
+                    if wrapper is None:
+                        # Wrap long lines at whitespace, never splitting words
+                        wrapper = _WRAPPERS[max_width] = textwrap.TextWrapper(
+                            max_width, break_long_words=False, break_on_hyphens=False)
+                lines.extend(wrapper.wrap(line))
             else:
                 lines.append(line)
         
@@ -186,25 +268,90 @@ class MessageHandler:
     
     def format_tool_results(self, results: List[Dict[str, Any]]) -> str:
         """Format tool results for display"""
+        # Use custom formatting for better readability
+        return self._format_tool_results(results, self.format_json_for_display)
+    
+    def format_tool_results_for_model(self, results: List[Dict[str, Any]]) -> str:
+        """Format tool results for the model, using plain JSON rather than the display formatter"""
+        return self._format_tool_results(results, _format_result_for_model)
+    
+    def _format_tool_results(self, results: List[Dict[str, Any]], format_result) -> str:
+        """Format tool results, rendering each successful result with format_result"""
         if not results:
             return ""
             
-        formatted_results = "\n\n**Tool Results:**\n"
+        parts = ["\n\n**Tool Results:**\n"]
+        append = parts.append
         for r in results:
-            formatted_results += f"\n**{r['tool']}**\n"
+            append(f"\n**{r['tool']}**\n")
             if not r['success']:
-                formatted_results += f"❌ Error: {r['error']}\n"
+                append(f"❌ Error: {r['error']}\n")
             else:
-                formatted_results += "✅ Success\n"
-                # Use custom formatting for better readability
-                formatted_json = self.format_json_for_display(r['result'])
-                formatted_results += f"```\n{formatted_json}\n```\n"
+                append("✅ Success\n")
+                formatted_json = format_result(r['result'])
+                append(f"```\n{formatted_json}\n```\n")
         
-        return formatted_results
+        return "".join(parts)
     
     def strip_tool_calls_from_response(self, response: str, tool_calls: List[Dict[str, Any]]) -> str:
         """Remove tool call blocks from the response"""
-        result = response
-        for call in tool_calls:
-            result = result.replace(call['original_text'], '')
-        return result.strip()
\ No newline at end of file
+        if not tool_calls:
+            return response.strip()
+        
+        if not all('span' in call for call in tool_calls):
+            # No recorded spans: remove every block text in a single regex pass,
+            # longest first so no block's text shadows a longer one it prefixes
+            texts = sorted({call['original_text'] for call in tool_calls}, key=len, reverse=True)
+            pattern = re.compile('|'.join(re.escape(text) for text in texts))
+            return pattern.sub('', response).strip()
+        
+        # Splice out the recorded spans in a single pass
+        parts = []
+        last = 0
+        for start, end in sorted(call['span'] for call in tool_calls):
+            parts.append(response[last:start])
+            last = end
+        parts.append(response[last:])
+        return "".join(parts).strip()
+
+
+def _clean_content(content: str) -> str:
+    """Clean up a response string for display"""
+    # Handle the Message object format
+    if content.startswith("model=") and "message=Message(" in content:
+        # Look for content with single or double quotes
+        match = _MODEL_CONTENT_RE.search(content)
+        if match:
+            actual_content = match.group(2)
+            content = actual_content.strip()
+    
+    # Fix Unicode issues
+    # Plain ASCII without escapes needs none of the Unicode work below,
+    # only the final placeholder cleanup
+    if content.isascii():
+        if '\\' not in content:
+            return content.replace('?', ' ')
+    else:
+        # Apply all replacements in a single pass
+        content = content.translate(MessageHandler._translate_table)
+    
+    # Try to decode any remaining escape sequences
+    if '\\n' in content or '\\u' in content or '\\x' in content:
+        content = _maybe_unescape(content)
+    
+    # Final cleanup - remove any remaining non-ASCII characters
+    # that might cause display issues
+    try:
+        # Try to encode to ASCII and replace problematic characters,
+        # turning the placeholder character into a space on the way
+        if not content.isascii():
+            content = content.encode('ascii', errors='replace').translate(_QUESTION_TO_SPACE).decode('ascii')
+        else:
+            content = content.replace('?', ' ')
+    except Exception:
+        # If even this fails, just return the content as is
+        pass
+    
+    return content
+
+_clean_content_cached = lru_cache(maxsize=256)(_clean_content)
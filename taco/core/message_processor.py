@@ -25,20 +25,21 @@ class MessageProcessor:
         if system_content:
             messages.append({"role": "system", "content": system_content})
         
-        # If in tool mode, modify the user's question for tool selection
-        modified_history = history.copy()
-        if tool_mode and not self.tool_stack.stack and modified_history:
-            last_message = modified_history[-1]
-            if last_message["role"] == "user":
-                # Modify the question to force tool selection
-                modified_history[-1] = {
-                    "role": "user", 
-                    "content": f"Select the best tool to handle this request: {last_message['content']}"
-                }
-                debug_logger.log("Modified user query for tool selection", "MESSAGE_PREP")
+        # If in tool mode, modify the user's question for tool selection;
+        # otherwise the history is added as is, without copying it first
+        if tool_mode and not self.tool_stack.tools and history and history[-1]["role"] == "user":
+            messages.extend(history[:-1])
+            # Modify the question to force tool selection
+            messages.append({
+                "role": "user", 
+                "content": f"Select the best tool to handle this request: {history[-1]['content']}"
+            })
+            debug_logger.log("Modified user query for tool selection", "MESSAGE_PREP")
+        else:
+            messages.extend(history)
         
-        messages.extend(modified_history)
-        debug_logger.log(f"Prepared {len(messages)} messages for LLM", "MESSAGE_PREP")
+        if debug_logger.enabled:
+            debug_logger.log(f"Prepared {len(messages)} messages for LLM", "MESSAGE_PREP")
         
         return messages
     
@@ -78,10 +79,11 @@ Tool results:
         # Check for tool calls in the response
         tool_calls = self.message_handler.parse_tool_calls(cleaned_response)
         
-        if tool_calls:
-            debug_logger.log(f"Found {len(tool_calls)} tool calls in response", "RESPONSE_PROC")
-        else:
-            debug_logger.log("No tool calls found in response", "RESPONSE_PROC")
+        if debug_logger.enabled:
+            if tool_calls:
+                debug_logger.log(f"Found {len(tool_calls)} tool calls in response", "RESPONSE_PROC")
+            else:
+                debug_logger.log("No tool calls found in response", "RESPONSE_PROC")
         
         return {
             "cleaned_response": cleaned_response,
@@ -2,13 +2,30 @@
 TACO Model Management - Robust version for various Ollama API formats
 """
 import os
-import json
-from typing import List, Dict, Any, Optional
-import ollama
-import requests
+import time
+from typing import Callable, Iterable, List, Dict, Any, Optional
 
 from taco.core.config import get_config, set_config_value
-from taco.utils.debug import debug_print
+from taco.utils import jsonio
+from taco.utils.debug import debug_enabled, debug_print
+
+# Seconds to wait on direct Ollama API requests before falling back
+API_TIMEOUT = 5
+
+# Seconds model listings and model info are reused before asking Ollama again
+MODEL_CACHE_TTL = 10.0
+
+def _accumulate_streaming_response(stream: Iterable[Any],
+                                   on_token: Optional[Callable[[str], None]] = None) -> str:
+    """Join the content of streamed chat chunks, passing each piece to on_token"""
+    parts = []
+    for chunk in stream:
+        content = chunk['message']['content']
+        if content:
+            parts.append(content)
+            if on_token is not None:
+                on_token(content)
+    return "".join(parts)
 
 class ModelManager:
     """Manages Ollama model selection and interaction"""
@@ -17,18 +34,57 @@ class ModelManager:
         """Initialize the model manager"""
         self.config = get_config().get('model', {})
         self.host = self.config.get('host', 'http://localhost:11434')
-        self.client = ollama.Client(host=self.host)
+        # The Ollama client and HTTP session are created on first use, so
+        # ollama and requests are only imported once a model is needed
+        self._client = None
+        self._session = None
+        # (expiry time, models) and model name -> (expiry time, info) caches
+        self._models_cache = (0.0, None)
+        self._model_info_cache: Dict[str, tuple] = {}
+    
+    def invalidate_cache(self):
+        """Drop cached model listings and info so the next call asks Ollama"""
+        self._models_cache = (0.0, None)
+        self._model_info_cache.clear()
+    
+    @property
+    def client(self):
+        """Ollama client, created on first use"""
+        if self._client is None:
+            import ollama
+            self._client = ollama.Client(host=self.host)
+        return self._client
+    
+    def _get_session(self):
+        """Keep-alive HTTP session so repeated API calls reuse one connection"""
+        if self._session is None:
+            import requests
+            self._session = requests.Session()
+            self._session.headers['Accept'] = 'application/json'
+        return self._session
     
     def list_models(self) -> List[Dict[str, Any]]:
+        """List available models, reusing the result for MODEL_CACHE_TTL seconds"""
+        now = time.monotonic()
+        expires_at, models = self._models_cache
+        if models is None or now >= expires_at:
+            models = self._fetch_models()
+            # An empty listing usually means Ollama is unreachable or models are
+            # still being pulled, so it isn't reused
+            self._models_cache = (now + MODEL_CACHE_TTL, models) if models else (0.0, None)
+        return models
+    
+    def _fetch_models(self) -> List[Dict[str, Any]]:
         """List available models from Ollama using direct API call for reliability"""
         try:
             debug_print(f"Attempting to list models from Ollama at {self.host}")
             
             # Try direct API call first for reliability
             try:
-                response = requests.get(f"{self.host}/api/tags")
+                response = self._get_session().get(f"{self.host}/api/tags", timeout=API_TIMEOUT)
                 data = response.json()
-                debug_print(f"Direct API response: {json.dumps(data)[:200]}...")
+                if debug_enabled():
+                    debug_print(f"Direct API response: {jsonio.dumps(data)[:200]}...")
                 
                 models = []
                 
@@ -95,9 +151,11 @@ class ModelManager:
         return self.config.get('default', 'gemma3')
     
     def set_default_model(self, model_name: str) -> bool:
-        """Set the default model"""
+        """Set the default model, rejecting names Ollama doesn't list"""
         try:
-            # Set in config without verification for now
+            if not self._is_known_model(model_name):
+                return False
+            
             set_config_value('model.default', model_name)
             self.config['default'] = model_name
             return True
@@ -105,40 +163,65 @@ class ModelManager:
             debug_print(f"Error setting default model: {str(e)}")
             return False
     
+    def _is_known_model(self, model_name: str) -> bool:
+        """Check a model name against the listing, refreshing a stale cached listing once"""
+        models = self.list_models()
+        if any(model['name'] == model_name for model in models):
+            return True
+        
+        # The cached listing may predate a model pulled since
+        self.invalidate_cache()
+        models = self.list_models()
+        
+        # An empty listing means Ollama couldn't be asked, so the name is accepted
+        return not models or any(model['name'] == model_name for model in models)
+    
     def get_model_info(self, model_name: str) -> Optional[Dict[str, Any]]:
-        """Get detailed information about a model"""
-        try:
-            # Try direct API call
-            try:
-                response = requests.get(f"{self.host}/api/show?name={model_name}")
-                data = response.json()
-                
-                if data:
-                    return {
-                        'name': model_name,
-                        'description': f"Model information",
-                        'parameters': data.get('parameters', 'Unknown'),
-                        'context_length': data.get('context_length', 'Unknown'),
-                    }
-            except Exception:
-                pass
-                
-            # Fallback to simple info
+        """Get detailed information about a model, reused for MODEL_CACHE_TTL seconds"""
+        now = time.monotonic()
+        cached = self._model_info_cache.get(model_name)
+        if cached is not None and now < cached[0]:
+            return cached[1]
+        
+        info = self._fetch_model_info(model_name)
+        if info is None:
+            # Fallback to simple info, not cached so a model pulled meanwhile shows up
             return {
                 'name': model_name,
                 'description': f"Model: {model_name}",
                 'parameters': 'Unknown',
                 'context_length': 'Unknown',
             }
+        
+        self._model_info_cache[model_name] = (now + MODEL_CACHE_TTL, info)
+        return info
+    
+    def _fetch_model_info(self, model_name: str) -> Optional[Dict[str, Any]]:
+        """Get detailed information about a model from Ollama, or None if it has none"""
+        try:
+            response = self._get_session().get(f"{self.host}/api/show?name={model_name}", timeout=API_TIMEOUT)
+            data = response.json()
         except Exception as e:
             debug_print(f"Error getting model info: {str(e)}")
             return None
+        
+        if not data:
+            return None
+        
+        return {
+            'name': model_name,
+            'description': f"Model information",
+            'parameters': data.get('parameters', 'Unknown'),
+            'context_length': data.get('context_length', 'Unknown'),
+        }
     
     def generate_response(self, model_name: str, messages: List[Dict[str, str]]) -> str:
         """Generate a response from the model"""
         try:
             debug_print(f"Generating response with model: {model_name}")
-            debug_print(f"Messages: {json.dumps(messages)[:200]}...")
+            # Only serialize the messages when the preview will be printed
+            if debug_enabled():
+                debug_print(f"Messages: {jsonio.dumps(messages)[:200]}...")
             
             response = self.client.chat(
                 model=model_name,
@@ -163,4 +246,20 @@ class ModelManager:
             return str(response)
         except Exception as e:
             debug_print(f"Error generating response: {str(e)}")
-            return f"Error: Could not generate response - {str(e)}"
\ No newline at end of file
+            return f"Error: Could not generate response - {str(e)}"
+    
+    def generate_streaming_response(self, model_name: str, messages: List[Dict[str, str]],
+                                    on_token: Optional[Callable[[str], None]] = None) -> str:
+        """Generate a response from the model, streaming it as it is produced"""
+        try:
+            debug_print(f"Streaming response with model: {model_name}")
+            
+            stream = self.client.chat(
+                model=model_name,
+                messages=messages,
+                stream=True
+            )
+            return _accumulate_streaming_response(stream, on_token)
+        except Exception as e:
+            debug_print(f"Error generating response: {str(e)}")
+            return f"Error: Could not generate response - {str(e)}"
@@ -5,9 +5,8 @@ Handles tool execution and parameter processing.
 """
 from typing import Dict, List, Any, Optional
 import traceback
-import json
-import inspect
 from taco.utils.debug_logger import debug_logger
+from taco.utils import jsonio
 
 class ToolExecutor:
     """Handles execution of tools with parameter processing"""
@@ -21,19 +20,24 @@ class ToolExecutor:
     def execute_tool_calls(self, tool_calls: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Execute tool calls and return results with details"""
         results = []
+        # Log messages are only built when debugging is on
+        debugging = debug_logger.enabled
         
-        debug_logger.log(f"Processing {len(tool_calls)} tool calls", "TOOL_EXEC")
-        debug_logger.log(f"Current tool stack: {len(self.tool_stack.stack)} items", "TOOL_EXEC")
-        
-        if self.tool_stack.stack:
-            for i, item in enumerate(self.tool_stack.stack):
-                debug_logger.log(f"Stack item {i}: {item['tool']}", "TOOL_EXEC")
+        if debugging:
+            entries = [
+                (f"Processing {len(tool_calls)} tool calls", "TOOL_EXEC"),
+                (f"Current tool stack: {len(self.tool_stack.tools)} items", "TOOL_EXEC")
+            ]
+            entries.extend((f"Stack item {i}: {name}", "TOOL_EXEC")
+                           for i, name in enumerate(self.tool_stack.tools))
+            debug_logger.log_batch(entries)
         
         for call in tool_calls:
             tool_name = call['tool_name']
             params = call['parameters']
             
-            debug_logger.log_tool_call(tool_name, params)
+            if debugging:
+                debug_logger.log_tool_call(tool_name, params)
             
             # Special handling for create_code tool that receives 'code' instead of 'prompt'
             if tool_name == 'create_code' and 'prompt' not in params and 'code' in params:
@@ -63,12 +67,14 @@ class ToolExecutor:
                 continue
             
             # If this is the initial tool selection, get usage instructions directly
-            if not self.tool_stack.stack:
-                debug_logger.log(f"Getting usage instructions for {tool_name}", "TOOL_EXEC")
+            if not self.tool_stack.tools:
+                if debugging:
+                    debug_logger.log(f"Getting usage instructions for {tool_name}", "TOOL_EXEC")
                 
                 # Get usage instructions directly from the tool
                 usage_instructions = tool.get_usage_instructions()
-                debug_logger.log(f"Usage instructions length: {len(usage_instructions)}", "TOOL_EXEC")
+                if debugging:
+                    debug_logger.log(f"Usage instructions length: {len(usage_instructions)}", "TOOL_EXEC")
                 
                 # Return the usage instructions as a result
                 results.append({
@@ -86,24 +92,21 @@ class ToolExecutor:
             # Normal tool execution follows...
             try:
                 # Check for missing parameters using context
-                func = tool.func
-                if hasattr(func, '__wrapped__'):  # Get original function if wrapped
-                    func = func.__wrapped__
-                
-                # Log function signature for debugging
-                sig = inspect.signature(func)
-                debug_logger.log(f"Tool function signature: {sig}", "TOOL_EXEC")
-                debug_logger.log(f"Expected parameters: {list(sig.parameters.keys())}", "TOOL_EXEC")
+                func = tool.unwrapped_func  # Unwrapped from any decorators at registration
                 
                 updated_params, missing_params = self.context_manager.check_missing_parameters(func, params)
                 
-                debug_logger.log(f"Original params: {json.dumps(params)}", "TOOL_EXEC")
-                debug_logger.log(f"Updated params: {json.dumps(updated_params)}", "TOOL_EXEC")
-                
-                if missing_params:
-                    debug_logger.log(f"Missing params: {missing_params}", "TOOL_EXEC", "yellow")
-                else:
-                    debug_logger.log("No missing params", "TOOL_EXEC", "green")
+                # Log function signature and parameters for debugging
+                if debugging:
+                    sig = tool.unwrapped_sig
+                    debug_logger.log_batch([
+                        (f"Tool function signature: {sig}", "TOOL_EXEC"),
+                        (f"Expected parameters: {list(sig.parameters.keys())}", "TOOL_EXEC"),
+                        (f"Original params: {jsonio.dumps(params)}", "TOOL_EXEC"),
+                        (f"Updated params: {jsonio.dumps(updated_params)}", "TOOL_EXEC"),
+                        (f"Missing params: {missing_params}", "TOOL_EXEC", "yellow") if missing_params
+                        else ("No missing params", "TOOL_EXEC", "green")
+                    ])
                 
                 # Convert parameters based on tool signature
                 converted_params = {}
@@ -114,19 +117,23 @@ class ToolExecutor:
                     else:
                         converted_params[param_name] = param_value
                 
-                debug_logger.log(f"Converted params: {json.dumps(converted_params)}", "TOOL_EXEC")
+                if debugging:
+                    debug_logger.log(f"Converted params: {jsonio.dumps(converted_params)}", "TOOL_EXEC")
                 
                 # Execute with properly typed parameters
                 result = tool.execute(**converted_params)
                 
                 # Log tool execution result
-                if isinstance(result, dict):
-                    debug_logger.log(f"Tool execution result status: {result.get('status', 'N/A')}", "TOOL_EXEC")
+                if debugging and isinstance(result, dict):
+                    entries = [(f"Tool execution result status: {result.get('status', 'N/A')}", "TOOL_EXEC")]
                     
                     if result.get('status') == 'needs_parameters':
-                        debug_logger.log_success("Tool needs parameters collection!")
-                        debug_logger.log(f"Questions: {result.get('questions', [])}", "TOOL_EXEC", "green")
-                        debug_logger.log(f"Parameter names: {result.get('parameter_names', [])}", "TOOL_EXEC", "green")
+                        entries.extend([
+                            ("Tool needs parameters collection!", "SUCCESS", "green"),
+                            (f"Questions: {result.get('questions', [])}", "TOOL_EXEC", "green"),
+                            (f"Parameter names: {result.get('parameter_names', [])}", "TOOL_EXEC", "green")
+                        ])
+                    debug_logger.log_batch(entries)
                 
                 # Check if tool needs parameter collection
                 if isinstance(result, dict) and result.get('status') == 'needs_parameters':
@@ -138,7 +145,8 @@ class ToolExecutor:
                         'parameter_names': result.get('parameter_names', [])
                     })
                     
-                    debug_logger.log_stack_update("push", "collect_tool_parameters", len(self.tool_stack.stack))
+                    if debugging:
+                        debug_logger.log_stack_update("push", "collect_tool_parameters", len(self.tool_stack.tools))
                 
                 results.append({
                     'tool': tool_name,
@@ -163,9 +171,10 @@ class ToolExecutor:
                     'success': False
                 })
         
-        debug_logger.log(f"Final tool stack after execution: {len(self.tool_stack.stack)} items", "TOOL_EXEC")
-        if self.tool_stack.stack:
-            for i, item in enumerate(self.tool_stack.stack):
-                debug_logger.log(f"Stack item {i}: {item['tool']}", "TOOL_EXEC")
+        if debugging:
+            entries = [(f"Final tool stack after execution: {len(self.tool_stack.tools)} items", "TOOL_EXEC")]
+            entries.extend((f"Stack item {i}: {name}", "TOOL_EXEC")
+                           for i, name in enumerate(self.tool_stack.tools))
+            debug_logger.log_batch(entries)
         
         return results
\ No newline at end of file
@@ -2,57 +2,134 @@
 TACO Tool Stack Management
 Handles the orchestration of tool workflows and maintains execution context.
 """
+import os
+import re
+import time
 from typing import Dict, Any, List, Optional
 from datetime import datetime
-from rich.console import Console
-from rich.panel import Panel
-from rich.prompt import Prompt
 
-console = Console()
+# Rich is only needed for prompts and stack output, so it is imported on first use
+console = None
+
+def _get_console():
+    """Get the shared Rich console, importing Rich on first use"""
+    global console
+    if console is None:
+        from rich.console import Console
+        console = Console()
+    return console
+
+# Stack debug output is shown at these TACO_DEBUG_LEVEL settings, read once at import
+_DEBUG_MODE = os.environ.get('TACO_DEBUG_LEVEL', 'INFO').upper() in ('DEBUG', 'VERBOSE')
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Phrases that signal the user is switching context, in lowercase
+CONTEXT_SWITCH_PHRASES = (
+    "forget about",
+    "never mind",
+    "let's talk about",
+    "change the subject",
+    "different question",
+    "something else",
+    "what's the weather",  # Common context switch example
+    "tell me a joke",      # Another common context switch
+)
+
+# First letters of the phrases; input containing none of them can't match any
+_PHRASE_FIRST_CHARS = frozenset(phrase[0] for phrase in CONTEXT_SWITCH_PHRASES)
+
+def _build_phrase_matcher():
+    """Build a function finding any context switch phrase in one pass over the input"""
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for phrase in CONTEXT_SWITCH_PHRASES:
+            automaton.add_word(phrase, phrase)
+        automaton.make_automaton()
+        return lambda text: next(automaton.iter(text), None) is not None
+    
+    pattern = re.compile('|'.join(map(re.escape, CONTEXT_SWITCH_PHRASES)))
+    return lambda text: pattern.search(text) is not None
+
+_contains_switch_phrase = _build_phrase_matcher()
+
+def _debug_stack(*messages: str) -> None:
+    """Print stack debug messages; only called when _DEBUG_MODE is set"""
+    for message in messages:
+        _get_console().print(f"[magenta]DEBUG STACK: {message}[/magenta]")
+
+def _format_timestamp(timestamp: float) -> str:
+    """Format a frame's push time as a local ISO timestamp"""
+    return datetime.fromtimestamp(timestamp).isoformat()
+
+# System prompt suffix describing an active workflow; the optional lines
+# are filled in already formatted, or left empty
+_SYSTEM_CONTEXT_TEMPLATE = (
+    "\n\nCurrent tool workflow context:\n"
+    "- Active tool: {tool}\n"
+    "{waiting_for}{parameters_needed}{original_prompt}"
+    "- Stack depth: {depth}\n"
+    "\nThe user is currently in a tool workflow. Stay focused on completing the current task."
+)
 
 class ToolStack:
     """Manages the tool execution stack for complex workflows"""
     
     def __init__(self):
         """Initialize the tool stack"""
-        self.stack: List[Dict[str, Any]] = []
+        # Frames are kept as parallel lists, one entry per frame in each
+        self.tools: List[str] = []
+        self.contexts: List[Dict[str, Any]] = []
+        # Push times as epoch seconds, only turned into ISO strings when read
+        self.timestamps: List[float] = []
         self.original_prompt: Optional[str] = None
         self.max_stack_depth: int = 20
     
+    @property
+    def stack(self) -> List[Dict[str, Any]]:
+        """The stack frames as dicts with 'tool', 'context' and 'timestamp' keys"""
+        return [
+            {'tool': tool, 'context': context, 'timestamp': _format_timestamp(timestamp)}
+            for tool, context, timestamp in zip(self.tools, self.contexts, self.timestamps)
+        ]
+    
     def push(self, tool_name: str, context: Dict[str, Any] = None) -> None:
         """Push a tool onto the stack"""
-        self.stack.append({
-            'tool': tool_name,
-            'context': context or {},
-            'timestamp': datetime.now().isoformat()
-        })
+        self.tools.append(tool_name)
+        self.contexts.append(context or {})
+        self.timestamps.append(time.time())
     
     def pop(self) -> Optional[Dict[str, Any]]:
         """Pop a tool from the stack"""
-        if self.stack:
-            return self.stack.pop()
+        if self.tools:
+            return {
+                'tool': self.tools.pop(),
+                'context': self.contexts.pop(),
+                'timestamp': _format_timestamp(self.timestamps.pop())
+            }
         return None
     
     def clear(self) -> None:
         """Clear the tool stack and original prompt"""
-        self.stack = []
+        self.tools = []
+        self.contexts = []
+        self.timestamps = []
         self.original_prompt = None
     
     def get_depth(self) -> int:
         """Get current stack depth"""
-        return len(self.stack)
+        return len(self.tools)
     
     def get_current_tool(self) -> Optional[str]:
         """Get the name of the currently active tool"""
-        if self.stack:
-            return self.stack[-1]['tool']
-        return None
+        return self.tools[-1] if self.tools else None
     
     def get_current_context(self) -> Optional[Dict[str, Any]]:
         """Get the context of the currently active tool"""
-        if self.stack:
-            return self.stack[-1]['context']
-        return None
+        return self.contexts[-1] if self.contexts else None
     
     def set_original_prompt(self, prompt: str) -> None:
         """Set the original user prompt for this workflow"""
@@ -60,16 +137,13 @@ class ToolStack:
     
     def format_stack(self) -> str:
         """Format the tool stack for display"""
-        if not self.stack:
+        if not self.tools:
             return "No active tool workflow"
         
-        lines = ["Tool Stack:"]
-        for i, item in enumerate(self.stack):
-            indent = "  " * i
-            tool_name = item['tool']
-            context = item.get('context', {})
-            status = context.get('status', 'active')
-            lines.append(f"{indent}└─ {tool_name} [{status}]")
+        lines = ["Tool Stack:", *(
+            f"{'  ' * i}└─ {tool_name} [{context.get('status', 'active')}]"
+            for i, (tool_name, context) in enumerate(zip(self.tools, self.contexts))
+        )]
         
         if self.original_prompt:
             lines.append(f"\nOriginal request: {self.original_prompt}")
@@ -84,7 +158,11 @@ class ToolStack:
         depth = self.get_depth()
         
         if depth >= self.max_stack_depth:
+            from rich.panel import Panel
+            from rich.prompt import Prompt
+            
             # Show status and ask for confirmation
+            console = _get_console()
             console.print(Panel(self.format_stack(), title="Tool Stack Status", border_style="yellow"))
             console.print(f"\n[yellow]Warning: Tool stack depth has reached {depth} levels.[/yellow]")
             
@@ -100,56 +178,38 @@ class ToolStack:
     
     def get_system_context(self) -> str:
         """Get tool stack context for system prompt"""
-        if not self.stack:
+        if not self.tools:
             return ""
         
-        context = "\n\nCurrent tool workflow context:\n"
-        context += f"- Active tool: {self.get_current_tool()}\n"
-        
-        tool_context = self.get_current_context()
-        if tool_context:
-            if 'waiting_for' in tool_context:
-                context += f"- Waiting for: {tool_context['waiting_for']}\n"
-            if 'parameters_needed' in tool_context:
-                context += f"- Parameters needed: {', '.join(tool_context['parameters_needed'])}\n"
-        
-        if self.original_prompt:
-            context += f"- Original request: {self.original_prompt}\n"
-        
-        context += f"- Stack depth: {self.get_depth()}\n"
-        context += "\nThe user is currently in a tool workflow. Stay focused on completing the current task."
-        
-        return context
+        tool_context = self.contexts[-1]
+        return _SYSTEM_CONTEXT_TEMPLATE.format(
+            tool=self.tools[-1],
+            waiting_for=f"- Waiting for: {tool_context['waiting_for']}\n"
+                        if 'waiting_for' in tool_context else "",
+            parameters_needed=f"- Parameters needed: {', '.join(tool_context['parameters_needed'])}\n"
+                              if 'parameters_needed' in tool_context else "",
+            original_prompt=f"- Original request: {self.original_prompt}\n"
+                            if self.original_prompt else "",
+            depth=len(self.tools)
+        )
     
     def is_context_switch(self, user_input: str) -> bool:
         """Detect if the user is switching context"""
-        if not self.stack or not user_input:
+        if not self.tools or not user_input:
             return False
         
-        # Check for explicit context switch indicators
-        context_switch_phrases = [
-            "forget about",
-            "never mind",
-            "let's talk about",
-            "change the subject",
-            "different question",
-            "something else",
-            "what's the weather",  # Common context switch example
-            "tell me a joke",      # Another common context switch
-        ]
-        
+        # Check for explicit context switch indicators, skipping the match
+        # for input such as bare parameter values that shares no first letter
         input_lower = user_input.lower()
-        for phrase in context_switch_phrases:
-            if phrase in input_lower:
-                return True
+        if not _PHRASE_FIRST_CHARS.isdisjoint(input_lower) and _contains_switch_phrase(input_lower):
+            return True
         
         # If we're collecting parameters and user asks something completely unrelated
-        current_tool = self.get_current_tool()
-        if current_tool == "collect_tool_parameters":
-            # Use simple heuristics - if the question doesn't look like a parameter value
-            if len(user_input.split()) > 5:  # Longer questions are likely new requests
-                return True
-            if user_input.endswith('?'):  # Questions are likely new requests
+        if self.tools[-1] == "collect_tool_parameters":
+            # Use simple heuristics - if the question doesn't look like a parameter value.
+            # Longer questions and questions are likely new requests; splitting stops
+            # after the sixth word, which is all the length check needs
+            if user_input.endswith('?') or len(user_input.split(None, 5)) > 5:
                 return True
         
         return False
@@ -159,9 +219,11 @@ class ToolStack:
         Handle empty user response during tool workflow.
         Returns None if continuing, or a message if cancelled.
         """
-        if not self.stack:
+        if not self.tools:
             return None
         
+        from rich.prompt import Prompt
+        
         response = Prompt.ask("Continue with current task? [Y/n]", default="y")
         if response.lower() != 'y':
             self.clear()
@@ -171,26 +233,18 @@ class ToolStack:
     
     def process_tool_result(self, tool_name: str, result: Dict[str, Any], success: bool) -> None:
         """Process a tool result and update stack accordingly"""
-        # Add missing import
-        import os
-        import json
-        from rich.console import Console
-        console = Console()
-        
-        # Get debug mode from environment variable
-        debug_mode = os.environ.get('TACO_DEBUG_LEVEL', 'INFO').upper() in ['DEBUG', 'VERBOSE']
-        
-        if debug_mode:
-            console.print(f"[magenta]DEBUG STACK: Processing result for tool: {tool_name}[/magenta]")
-            console.print(f"[magenta]DEBUG STACK: Success: {success}[/magenta]")
+        # The guards skip building debug messages entirely when debugging is off
+        if _DEBUG_MODE:
+            _debug_stack(f"Processing result for tool: {tool_name}",
+                         f"Success: {success}")
             if isinstance(result, dict):
-                console.print(f"[magenta]DEBUG STACK: Result status: {result.get('status', 'N/A')}[/magenta]")
+                _debug_stack(f"Result status: {result.get('status', 'N/A')}")
                 if 'next_tool' in result:
-                    console.print(f"[magenta]DEBUG STACK: Next tool: {result['next_tool']}[/magenta]")
+                    _debug_stack(f"Next tool: {result['next_tool']}")
         
         if not success:
             # Tool failed - clear the stack
-            console.print(f"[red]Tool {tool_name} failed. Clearing tool stack.[/red]")
+            _get_console().print(f"[red]Tool {tool_name} failed. Clearing tool stack.[/red]")
             self.clear()
             return
         
@@ -200,23 +254,23 @@ class ToolStack:
                 # Tool is starting - push to stack
                 self.push(tool_name, {'status': 'initializing'})
                 
-                if debug_mode:
-                    console.print(f"[magenta]DEBUG STACK: Pushed {tool_name} to stack after instructions[/magenta]")
-                    console.print(f"[magenta]DEBUG STACK: Stack size: {len(self.stack)}[/magenta]")
+                if _DEBUG_MODE:
+                    _debug_stack(f"Pushed {tool_name} to stack after instructions",
+                                 f"Stack size: {len(self.tools)}")
             
             # Check if tool needs another tool
             if result.get('next_tool'):
                 next_tool = result['next_tool']
                 self.push(next_tool, result.get('context', {}))
                 
-                if debug_mode:
-                    console.print(f"[magenta]DEBUG STACK: Pushed next tool {next_tool} to stack[/magenta]")
-                    console.print(f"[magenta]DEBUG STACK: Stack size: {len(self.stack)}[/magenta]")
+                if _DEBUG_MODE:
+                    _debug_stack(f"Pushed next tool {next_tool} to stack",
+                                 f"Stack size: {len(self.tools)}")
             
             # Check if tool is complete
             if result.get('status') == 'complete':
                 popped = self.pop()
                 
-                if debug_mode:
-                    console.print(f"[magenta]DEBUG STACK: Popped {popped['tool'] if popped else 'None'} from stack[/magenta]")
-                    console.print(f"[magenta]DEBUG STACK: Stack size: {len(self.stack)}[/magenta]")
+                if _DEBUG_MODE:
+                    _debug_stack(f"Popped {popped['tool'] if popped else 'None'} from stack",
+                                 f"Stack size: {len(self.tools)}")
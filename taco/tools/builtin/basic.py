@@ -2,8 +2,15 @@
 TACO Basic Tools - Simple utility functions
 """
 from typing import Dict, Any, List, Optional
+import functools
 import math
 
+# Results remembered per financial calculator; LLM tool loops often repeat a call
+FINANCE_CACHE_SIZE = 1024
+
+# Every tool here is a pure function (lru_cache is thread-safe), so each one
+# is marked _thread_safe and may run alongside other tool calls
+
 # COMPOUND INTEREST CALCULATOR
 def calculate_compound_interest(principal: float, rate: float, time: float, compounds_per_year: int = 12) -> Dict[str, float]:
     """
@@ -21,16 +28,22 @@ def calculate_compound_interest(principal: float, rate: float, time: float, comp
     # Convert percentage to decimal if needed
     if rate > 1:
         rate = rate / 100
-        
-    final_amount = principal * (1 + rate/compounds_per_year)**(compounds_per_year*time)
-    interest_earned = final_amount - principal
+    
+    final_amount, interest_earned = _compound_interest(principal, rate, time, compounds_per_year)
     
     return {
-        "final_amount": round(final_amount, 2),
-        "interest_earned": round(interest_earned, 2),
+        "final_amount": final_amount,
+        "interest_earned": interest_earned,
         "input_rate_percent": rate * 100
     }
 
+@functools.lru_cache(maxsize=FINANCE_CACHE_SIZE, typed=True)
+def _compound_interest(principal: float, rate: float, time: float, compounds_per_year: int) -> tuple:
+    """Rounded (final amount, interest earned) for a decimal rate"""
+    final_amount = principal * (1 + rate/compounds_per_year)**(compounds_per_year*time)
+    interest_earned = final_amount - principal
+    return round(final_amount, 2), round(interest_earned, 2)
+
 def _get_calculate_compound_interest_description():
     """Get description for calculate_compound_interest tool"""
     return "calculate_compound_interest: Calculate compound interest for investments"
@@ -59,16 +72,108 @@ Note: Rate can be provided as decimal (0.05) or percentage (5).
 
 calculate_compound_interest._get_tool_description = _get_calculate_compound_interest_description
 calculate_compound_interest._get_usage_instructions = _get_calculate_compound_interest_usage
+calculate_compound_interest._thread_safe = True
+
+def calculate_compound_interest_batch(principal: List[float], rate: List[float], time: List[float], compounds_per_year: int = 12) -> Dict[str, List[float]]:
+    """
+    Calculate compound interest for several investments at once
+    
+    Args:
+        principal: Initial investment amounts
+        rate: Annual interest rates (as decimals or percentages)
+        time: Investment periods in years
+        compounds_per_year: Number of times interest is compounded per year
+    
+    Any of principal, rate and time may be a single value shared by every scenario.
+    
+    Returns:
+        Dict of lists with one final amount, interest earned and rate per scenario
+    """
+    principal, rate, time = _broadcast(principal=principal, rate=rate, time=time)
+    
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+    
+    if np is None:
+        # Without NumPy, run the scalar calculator once per scenario
+        scenarios = [calculate_compound_interest(p, r, t, compounds_per_year)
+                     for p, r, t in zip(principal, rate, time)]
+        return {key: [scenario[key] for scenario in scenarios]
+                for key in ("final_amount", "interest_earned", "input_rate_percent")}
+    
+    principal = np.array(principal, dtype=np.float64)
+    rate = np.array(rate, dtype=np.float64)
+    time = np.array(time, dtype=np.float64)
+    # Convert percentages to decimals where needed
+    rate = np.where(rate > 1, rate / 100, rate)
+    
+    final_amount = principal * np.power(1 + rate/compounds_per_year, compounds_per_year*time)
+    interest_earned = final_amount - principal
+    
+    return {
+        "final_amount": np.round(final_amount, 2).tolist(),
+        "interest_earned": np.round(interest_earned, 2).tolist(),
+        "input_rate_percent": (rate * 100).tolist()
+    }
+
+def _broadcast(**values) -> List[List[float]]:
+    """Turn each value into a list of floats, repeating single values to the lists' length"""
+    lists = {name: [float(item) for item in value] if isinstance(value, (list, tuple)) else [float(value)]
+             for name, value in values.items()}
+    
+    lengths = {len(items) for items in lists.values()} - {1}
+    if len(lengths) > 1:
+        sizes = ", ".join(f"{name} has {len(items)}" for name, items in lists.items())
+        raise ValueError(f"Lists must all have the same length or a single value ({sizes})")
+    
+    length = lengths.pop() if lengths else 1
+    return [items * length if len(items) == 1 else items for items in lists.values()]
+
+def _get_calculate_compound_interest_batch_description():
+    """Get description for calculate_compound_interest_batch tool"""
+    return "calculate_compound_interest_batch: Calculate compound interest for several investments at once"
+
+def _get_calculate_compound_interest_batch_usage():
+    """Get usage instructions for calculate_compound_interest_batch tool"""
+    return """
+Calculate compound interest for several investment scenarios in one call.
+
+Example:
+```json
+{
+  "tool_call": {
+    "name": "calculate_compound_interest_batch",
+    "parameters": {
+      "principal": [10000, 20000, 5000],
+      "rate": [0.05, 0.04, 6],
+      "time": 10,
+      "compounds_per_year": 12
+    }
+  }
+}
+```
+Note: principal, rate and time can each be a list or a single value used for every scenario.
+Rates can be provided as decimals (0.05) or percentages (5).
+"""
+
+calculate_compound_interest_batch._get_tool_description = _get_calculate_compound_interest_batch_description
+calculate_compound_interest_batch._get_usage_instructions = _get_calculate_compound_interest_batch_usage
+calculate_compound_interest_batch._thread_safe = True
 
 # TEXT ANALYZER
+# Deletes sentence terminators, so the length difference counts them in one pass
+_DELETE_TERMINATORS = str.maketrans('', '', '.!?')
+
 def analyze_text(text: str) -> Dict[str, Any]:
     """Analyze text and return statistics"""
     words = text.split()
     return {
         "word_count": len(words),
         "char_count": len(text),
-        "avg_word_length": round(sum(len(word) for word in words) / max(len(words), 1), 2),
-        "sentence_count": text.count('.') + text.count('!') + text.count('?')
+        "avg_word_length": round(len(''.join(words)) / max(len(words), 1), 2),
+        "sentence_count": len(text) - len(text.translate(_DELETE_TERMINATORS))
     }
 
 def _get_analyze_text_description():
@@ -95,8 +200,35 @@ Example:
 
 analyze_text._get_tool_description = _get_analyze_text_description
 analyze_text._get_usage_instructions = _get_analyze_text_usage
+analyze_text._thread_safe = True
 
 # TEMPERATURE CONVERTER
+# Unit names normalized to a single letter; the single letters are listed in
+# both cases so the usual unit spellings resolve without uppercasing
+_TEMPERATURE_UNITS = {
+    'CELSIUS': 'C',
+    'FAHRENHEIT': 'F',
+    'KELVIN': 'K',
+    'C': 'C',
+    'F': 'F',
+    'K': 'K',
+    'c': 'C',
+    'f': 'F',
+    'k': 'K'
+}
+
+# (from, to) -> (offset, numerator, denominator, shift), applied as
+# (value - offset) * numerator / denominator + shift; kept in that order so
+# results match the plain formulas exactly
+_TEMPERATURE_CONVERSIONS = {
+    ('C', 'F'): (0, 9, 5, 32),
+    ('F', 'C'): (32, 5, 9, 0),
+    ('C', 'K'): (0, 1, 1, 273.15),
+    ('K', 'C'): (273.15, 1, 1, 0),
+    ('F', 'K'): (32, 5, 9, 273.15),
+    ('K', 'F'): (273.15, 9, 5, 32)
+}
+
 def convert_temperature(value: float, from_unit: str, to_unit: str) -> float:
     """
     Convert temperature between Celsius, Fahrenheit, and Kelvin
@@ -110,37 +242,20 @@ def convert_temperature(value: float, from_unit: str, to_unit: str) -> float:
         Converted temperature value
     """
     # Normalize units to single letter
-    unit_map = {
-        'CELSIUS': 'C',
-        'FAHRENHEIT': 'F',
-        'KELVIN': 'K',
-        'C': 'C',
-        'F': 'F',
-        'K': 'K'
-    }
-    
-    from_unit = unit_map.get(from_unit.upper())
-    to_unit = unit_map.get(to_unit.upper())
+    from_unit = _TEMPERATURE_UNITS.get(from_unit) or _TEMPERATURE_UNITS.get(from_unit.upper())
+    to_unit = _TEMPERATURE_UNITS.get(to_unit) or _TEMPERATURE_UNITS.get(to_unit.upper())
     
     if not from_unit or not to_unit:
         raise ValueError(f"Invalid temperature unit. Valid units are: Celsius/C, Fahrenheit/F, Kelvin/K")
-
-    conversions = {
-        "C_to_F": lambda x: x * 9/5 + 32,
-        "F_to_C": lambda x: (x - 32) * 5/9,
-        "C_to_K": lambda x: x + 273.15,
-        "K_to_C": lambda x: x - 273.15,
-        "F_to_K": lambda x: (x - 32) * 5/9 + 273.15,
-        "K_to_F": lambda x: (x - 273.15) * 9/5 + 32
-    }
     
-    key = f"{from_unit}_to_{to_unit}"
-    if key not in conversions:
+    coefficients = _TEMPERATURE_CONVERSIONS.get((from_unit, to_unit))
+    if coefficients is None:
         if from_unit == to_unit:
             return round(value, 2)
         raise ValueError(f"Unsupported conversion: {from_unit} to {to_unit}")
-        
-    return round(conversions[key](value), 2)
+    
+    offset, numerator, denominator, shift = coefficients
+    return round((value - offset) * numerator / denominator + shift, 2)
 
 def _get_convert_temperature_description():
     """Get description for convert_temperature tool"""
@@ -169,6 +284,7 @@ Units: C/Celsius, F/Fahrenheit, K/Kelvin
 
 convert_temperature._get_tool_description = _get_convert_temperature_description
 convert_temperature._get_usage_instructions = _get_convert_temperature_usage
+convert_temperature._thread_safe = True
 
 # MORTGAGE CALCULATOR
 def calculate_mortgage(principal: float, annual_rate: float, years: int) -> Dict[str, float]:
@@ -183,6 +299,17 @@ def calculate_mortgage(principal: float, annual_rate: float, years: int) -> Dict
     Returns:
         Dict containing monthly payment, total payment, and total interest
     """
+    monthly_payment, total_payment, total_interest = _mortgage(principal, annual_rate, years)
+    
+    return {
+        "monthly_payment": monthly_payment,
+        "total_payment": total_payment,
+        "total_interest": total_interest
+    }
+
+@functools.lru_cache(maxsize=FINANCE_CACHE_SIZE, typed=True)
+def _mortgage(principal: float, annual_rate: float, years: int) -> tuple:
+    """Rounded (monthly payment, total payment, total interest) for a percentage rate"""
     # Convert annual rate from percentage to decimal
     annual_rate = annual_rate / 100
     
@@ -194,17 +321,14 @@ def calculate_mortgage(principal: float, annual_rate: float, years: int) -> Dict
     if monthly_rate == 0:
         monthly_payment = principal / num_payments
     else:
-        # Standard mortgage payment formula
-        monthly_payment = principal * (monthly_rate * (1 + monthly_rate)**num_payments) / ((1 + monthly_rate)**num_payments - 1)
+        # Standard mortgage payment formula, with the growth factor computed once
+        growth = (1 + monthly_rate)**num_payments
+        monthly_payment = principal * (monthly_rate * growth) / (growth - 1)
     
     total_payment = monthly_payment * num_payments
     total_interest = total_payment - principal
     
-    return {
-        "monthly_payment": round(monthly_payment, 2),
-        "total_payment": round(total_payment, 2),
-        "total_interest": round(total_interest, 2)
-    }
+    return round(monthly_payment, 2), round(total_payment, 2), round(total_interest, 2)
 
 def _get_calculate_mortgage_description():
     """Get description for calculate_mortgage tool"""
@@ -232,4 +356,5 @@ Note: Annual rate should be provided as a percentage (e.g., 3.5 for 3.5%).
 """
 
 calculate_mortgage._get_tool_description = _get_calculate_mortgage_description
-calculate_mortgage._get_usage_instructions = _get_calculate_mortgage_usage
\ No newline at end of file
+calculate_mortgage._get_usage_instructions = _get_calculate_mortgage_usage
+calculate_mortgage._thread_safe = True
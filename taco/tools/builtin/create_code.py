@@ -4,12 +4,117 @@ Enhanced with context-aware parameter handling
 """
 import os
 import sys
-from typing import Dict, Any, Optional
+import json
+import functools
+from typing import Dict, Any, Optional, Tuple
 from pathlib import Path
-from taco.core.config import get_config
+from taco.core.config import get_config, get_config_path as _get_config_path
 from taco.core.model import ModelManager
 from taco.utils.debug_logger import debug_logger
 
+# Decodes JSON in place from an offset, tracking nesting and strings in one pass
+_DECODER = json.JSONDecoder()
+
+# Opening braces tried when looking for the JSON object in a reply
+MAX_JSON_CANDIDATES = 8
+
+def _find_json_object(text: str) -> Optional[Dict[str, Any]]:
+    """Decode the first JSON object with a 'code' key in text, trying a bounded number of opening braces"""
+    start = text.find('{')
+    for _ in range(MAX_JSON_CANDIDATES):
+        if start < 0:
+            break
+        try:
+            data = _DECODER.raw_decode(text, start)[0]
+        except json.JSONDecodeError:
+            # A brace in prose before the JSON; decoding stops at the first bad token
+            start = text.find('{', start + 1)
+            continue
+        # Objects without code are nested pieces of a reply that failed to decode
+        if isinstance(data, dict) and 'code' in data:
+            return data
+        start = text.find('{', start + 1)
+    return None
+
+def _parse_code_response(response: str) -> Dict[str, Any]:
+    """Extract code and metadata from the model's reply, treating non-JSON replies as code"""
+    # The prompt asks for only JSON, so parse the whole response first
+    try:
+        code_data = json.loads(response.strip())
+    except json.JSONDecodeError:
+        code_data = None
+    
+    if not (isinstance(code_data, dict) and 'code' in code_data):
+        # Otherwise decode the JSON object in place; it ends at its
+        # matching close brace, whatever text follows it
+        code_data = _find_json_object(response)
+    
+    if code_data is None:
+        # Fallback: treat entire response as code
+        return {
+            'code': response,
+            'language': 'text',
+            'filename': 'generated_code.txt',
+            'description': 'Generated code',
+            'requirements': []
+        }
+    
+    return {
+        'code': code_data['code'],
+        'language': code_data.get('language', 'text'),
+        'filename': code_data.get('filename', 'generated_code.txt'),
+        'description': code_data.get('description', ''),
+        'requirements': code_data.get('requirements', [])
+    }
+
+# Model manager shared by every call, created on first use
+_model_manager = None
+
+def _get_model_manager() -> ModelManager:
+    """Get the shared model manager, creating it on first use"""
+    global _model_manager
+    if _model_manager is None:
+        _model_manager = ModelManager()
+    return _model_manager
+
+# Prompt asking the model for code in JSON format, split around the user's request
+_CODE_PROMPT_PREFIX = """
+Generate code for the following request:
+"""
+
+_CODE_PROMPT_SUFFIX = """
+
+Return the code in JSON format with the following structure:
+{
+    "code": "the actual code here",
+    "language": "programming language used",
+    "filename": "suggested filename",
+    "description": "brief description of what the code does",
+    "requirements": ["list", "of", "required", "packages"] or null if none needed
+}
+
+Please provide only the JSON response, no additional text.
+"""
+
+def _get_tool_defaults() -> Tuple[str, str, str]:
+    """Configured (workingdir, requirements, model) defaults, reread when the config file changes"""
+    try:
+        config_mtime = os.stat(_get_config_path()).st_mtime_ns
+    except OSError:
+        config_mtime = None
+    return _tool_defaults(config_mtime)
+
+@functools.lru_cache(maxsize=1)
+def _tool_defaults(config_mtime: Optional[int]) -> Tuple[str, str, str]:
+    """Read the defaults from config; config_mtime only keys the cache"""
+    config = get_config()
+    tool_config = config.get('tools', {}).get('create_code', {})
+    return (
+        tool_config.get('workingdir', '~/code_projects'),
+        tool_config.get('requirements', 'requirements.txt'),
+        tool_config.get('model', config.get('model', {}).get('default', 'llama3'))
+    )
+
 def create_code(prompt: str = "", 
                code: str = "",  # Add this to handle incorrect parameter passing
                language: str = "",  # Handle language parameter that LLM is sending
@@ -34,24 +139,31 @@ def create_code(prompt: str = "",
     Returns:
         Dict containing generation result
     """
+    # Debug messages are only built when debugging is on
+    debugging = debug_logger.enabled
+    
     # Debug all parameters
-    print(f"DEBUG CREATE_CODE: Function called with parameters:", file=sys.stderr)
-    print(f"DEBUG CREATE_CODE: prompt={prompt}, code={code}, language={language}, description={description}", file=sys.stderr)
-    print(f"DEBUG CREATE_CODE: workingdir={workingdir}, requirements={requirements}, model={model}", file=sys.stderr)
-    print(f"DEBUG CREATE_CODE: _context_aware={_context_aware}", file=sys.stderr)
+    if debugging:
+        print(f"DEBUG CREATE_CODE: Function called with parameters:", file=sys.stderr)
+        print(f"DEBUG CREATE_CODE: prompt={prompt}, code={code}, language={language}, description={description}", file=sys.stderr)
+        print(f"DEBUG CREATE_CODE: workingdir={workingdir}, requirements={requirements}, model={model}", file=sys.stderr)
+        print(f"DEBUG CREATE_CODE: _context_aware={_context_aware}", file=sys.stderr)
     
     # Handle the case where 'code' is provided instead of 'prompt'
     if not prompt:
         if code:
-            print(f"DEBUG CREATE_CODE: Remapped 'code' to 'prompt': {code}", file=sys.stderr)
+            if debugging:
+                print(f"DEBUG CREATE_CODE: Remapped 'code' to 'prompt': {code}", file=sys.stderr)
             prompt = code
         elif description:
-            print(f"DEBUG CREATE_CODE: Remapped 'description' to 'prompt': {description}", file=sys.stderr)
+            if debugging:
+                print(f"DEBUG CREATE_CODE: Remapped 'description' to 'prompt': {description}", file=sys.stderr)
             prompt = description
     
     # If prompt is still empty, return an error
     if not prompt:
-        print(f"DEBUG CREATE_CODE: Error - missing prompt parameter", file=sys.stderr)
+        if debugging:
+            print(f"DEBUG CREATE_CODE: Error - missing prompt parameter", file=sys.stderr)
         return {
             'status': 'error',
             'message': "Missing 'prompt' parameter. Please provide a description of the code to generate."
@@ -63,23 +175,27 @@ def create_code(prompt: str = "",
     parameter_names = []
     
     if not workingdir:
-        print(f"DEBUG CREATE_CODE: Missing workingdir parameter", file=sys.stderr)
+        if debugging:
+            print(f"DEBUG CREATE_CODE: Missing workingdir parameter", file=sys.stderr)
         questions.append("What directory should I save the files in?")
         parameter_names.append("workingdir")
     if not requirements:
-        print(f"DEBUG CREATE_CODE: Missing requirements parameter", file=sys.stderr)
+        if debugging:
+            print(f"DEBUG CREATE_CODE: Missing requirements parameter", file=sys.stderr)
         questions.append("What should I name the requirements file?")
         parameter_names.append("requirements")
     if not model:
-        print(f"DEBUG CREATE_CODE: Missing model parameter", file=sys.stderr)
+        if debugging:
+            print(f"DEBUG CREATE_CODE: Missing model parameter", file=sys.stderr)
         questions.append("Which model should I use for code generation?")
         parameter_names.append("model")
     
     # If any parameters are missing, request collection
     if questions and _context_aware:
-        print(f"DEBUG CREATE_CODE: Returning needs_parameters status with {len(questions)} questions", file=sys.stderr)
-        print(f"DEBUG CREATE_CODE: Questions: {questions}", file=sys.stderr)
-        print(f"DEBUG CREATE_CODE: Parameter names: {parameter_names}", file=sys.stderr)
+        if debugging:
+            print(f"DEBUG CREATE_CODE: Returning needs_parameters status with {len(questions)} questions", file=sys.stderr)
+            print(f"DEBUG CREATE_CODE: Questions: {questions}", file=sys.stderr)
+            print(f"DEBUG CREATE_CODE: Parameter names: {parameter_names}", file=sys.stderr)
         
         return {
             'status': 'needs_parameters',
@@ -99,17 +215,11 @@ def create_code(prompt: str = "",
             }
         }
     
-    # Get config defaults
-    config = get_config()
-    tool_config = config.get('tools', {}).get('create_code', {})
-    
-    # Use defaults if not provided
-    if not workingdir:
-        workingdir = tool_config.get('workingdir', '~/code_projects')
-    if not requirements:
-        requirements = tool_config.get('requirements', 'requirements.txt')
-    if not model:
-        model = tool_config.get('model', config.get('model', {}).get('default', 'llama3'))
+    # Use config defaults if not provided
+    default_workingdir, default_requirements, default_model = _get_tool_defaults()
+    workingdir = workingdir or default_workingdir
+    requirements = requirements or default_requirements
+    model = model or default_model
     
     # Expand user path
     workingdir = os.path.expanduser(workingdir)
@@ -123,61 +233,26 @@ def create_code(prompt: str = "",
             'message': f"Failed to create working directory: {str(e)}"
         }
     
-    # Initialize model manager
-    model_manager = ModelManager()
+    # Reuse the shared model manager and its connection to Ollama
+    model_manager = _get_model_manager()
     
     # Generate code using the specified model
     try:
         # Create a direct prompt asking for code in JSON format
-        code_prompt = f"""
-Generate code for the following request:
-{prompt}
-
-Return the code in JSON format with the following structure:
-{{
-    "code": "the actual code here",
-    "language": "programming language used",
-    "filename": "suggested filename",
-    "description": "brief description of what the code does",
-    "requirements": ["list", "of", "required", "packages"] or null if none needed
-}}
-
-Please provide only the JSON response, no additional text.
-"""
+        code_prompt = _CODE_PROMPT_PREFIX + prompt + _CODE_PROMPT_SUFFIX
         
-        # Make direct Ollama API call
-        response = model_manager.generate_response(
+        # Stream the reply from Ollama rather than waiting on one blocking payload
+        response = model_manager.generate_streaming_response(
             model,
             [{"role": "user", "content": code_prompt}]
         )
         
-        # Parse the JSON response
-        try:
-            import json
-            import re
-            
-            # Try to find JSON in the response
-            json_match = re.search(r'({.*})', response, re.DOTALL)
-            if json_match:
-                code_data = json.loads(json_match.group(1))
-            else:
-                # If no JSON found, try to parse the whole response
-                code_data = json.loads(response)
-            
-            # Extract code and metadata
-            code_content = code_data.get('code', '')
-            language = code_data.get('language', 'text')
-            suggested_filename = code_data.get('filename', 'generated_code.txt')
-            description = code_data.get('description', '')
-            requirements_list = code_data.get('requirements', [])
-            
-        except (json.JSONDecodeError, KeyError) as e:
-            # Fallback: treat entire response as code
-            code_content = response
-            language = 'text'
-            suggested_filename = 'generated_code.txt'
-            description = 'Generated code'
-            requirements_list = []
+        parsed = _parse_code_response(response)
+        code_content = parsed['code']
+        language = parsed['language']
+        suggested_filename = parsed['filename']
+        description = parsed['description']
+        requirements_list = parsed['requirements']
         
         # Return the generated code data - let another tool handle saving
         return {
@@ -15,6 +15,41 @@ import traceback
 from taco.core.config import get_config
 from taco.utils.debug import debug_print
 
+def _to_bool(value: Any) -> bool:
+    """Convert an argument to bool, reading common true strings"""
+    if isinstance(value, str):
+        return value.lower() in ('true', '1', 'yes', 'y')
+    return bool(value)
+
+def _make_converter(target_type: Any) -> Optional[Callable[[Any], Any]]:
+    """Build the argument converter for a type hint, or None to pass values through"""
+    if target_type == bool:
+        return _to_bool
+    
+    if target_type in (int, float):
+        def convert_number(value: Any) -> Any:
+            if isinstance(value, str):
+                # Don't try to convert empty strings or special values
+                if value in ["", "none", "default"]:
+                    return value
+                cleaned_value = ''.join(c for c in value if c.isdigit() or c in '.-')
+                if cleaned_value:
+                    return target_type(cleaned_value)
+                return value
+            return target_type(value)
+        return convert_number
+    
+    # Default case: return value as-is if can't convert
+    if target_type == str or target_type == Any:
+        return None
+    
+    def convert_other(value: Any) -> Any:
+        try:
+            return target_type(value)
+        except (TypeError, ValueError):
+            return value
+    return convert_other
+
 @dataclass
 class ToolCall:
     """Represents a tool call with arguments and response"""
@@ -32,6 +67,13 @@ class Tool:
         self.description = func.__doc__ or "No description provided"
         self.type_hints = get_type_hints(func)
         self.sig = inspect.signature(func)
+        # Original function beneath any decorators, and the names of its parameters
+        self.unwrapped_func = inspect.unwrap(func)
+        self.unwrapped_sig = inspect.signature(self.unwrapped_func)
+        self.param_names = tuple(self.sig.parameters)
+        # Tools share model clients, sessions and loggers, so only tools marked
+        # with a true _thread_safe attribute may run alongside other calls
+        self.thread_safe = bool(getattr(func, '_thread_safe', False))
         self.type_map = {
             "number": (int, float),
             "integer": int,
@@ -41,6 +83,14 @@ class Tool:
             "object": dict
         }
         self.parameters = self._get_parameters(self.sig)
+        # Argument converters by parameter name, chosen once from the type hints
+        self._converters = {}
+        for name, hint in self.type_hints.items():
+            converter = _make_converter(hint)
+            if converter is not None:
+                self._converters[name] = converter
+        # Line for the LLM tools prompt, built on first use
+        self._prompt_fragment = None
     
     def _get_parameters(self, sig: inspect.Signature) -> Dict[str, Any]:
         """Extract parameter information from function signature"""
@@ -79,6 +129,12 @@ class Tool:
         
         return f"{self.name}: No description provided"
 
+    def get_prompt_fragment(self) -> str:
+        """Get the line describing this tool in the tools prompt"""
+        if self._prompt_fragment is None:
+            self._prompt_fragment = f"- {self.get_description()}\n"
+        return self._prompt_fragment
+
     def get_usage_instructions(self) -> str:
         """Get specific usage instructions for this tool"""
         # Check if the function has custom usage instructions
@@ -127,8 +183,6 @@ class Tool:
     
     def convert_argument(self, name: str, value: Any) -> Any:
         """Convert argument to the correct type based on type hints"""
-        target_type = self.type_hints.get(name, Any)
-        
         # Handle empty string or None values - don't convert
         if value == "" or value is None:
             return value
@@ -141,30 +195,11 @@ class Tool:
             except (ValueError, SyntaxError):
                 pass
         
-        # Handle special cases
-        if target_type == bool:
-            if isinstance(value, str):
-                return value.lower() in ('true', '1', 'yes', 'y')
-            return bool(value)
-        elif target_type in (int, float):
-            if isinstance(value, str):
-                # Don't try to convert empty strings or special values
-                if value in ["", "none", "default"]:
-                    return value
-                cleaned_value = ''.join(c for c in value if c.isdigit() or c in '.-')
-                if cleaned_value:
-                    return target_type(cleaned_value)
-                return value
-            return target_type(value)
-        
-        # Default case: return value as-is if can't convert
-        if target_type == str or target_type == Any:
-            return value
-        
-        try:
-            return target_type(value)
-        except (TypeError, ValueError):
+        # Convert with the parameter's precomputed converter, if it needs one
+        converter = self._converters.get(name)
+        if converter is None:
             return value
+        return converter(value)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert tool to dictionary representation"""
@@ -180,6 +215,10 @@ class ToolRegistry:
     def __init__(self):
         """Initialize the tool registry"""
         self.tools: Dict[str, Tool] = {}
+        # Incremented whenever a tool is added or replaced
+        self.version = 0
+        # get_tool_info results by tool name, dropped when the tool is replaced
+        self._tool_info_cache: Dict[str, Dict[str, Any]] = {}
         self._load_default_tools()
         self._load_config_tools()
     
@@ -248,6 +287,8 @@ class ToolRegistry:
         try:
             tool = Tool(func)
             self.tools[tool.name] = tool
+            self._tool_info_cache.pop(tool.name, None)
+            self.version += 1
             return True
         except Exception as e:
             debug_print(f"Error adding tool {func.__name__}: {str(e)}")
@@ -320,7 +361,16 @@ class ToolRegistry:
         ]
     
     def get_tool_info(self, name: str) -> Optional[Dict[str, Any]]:
-        """Get detailed information about a tool"""
+        """Get detailed information about a tool
+
+        The result is cached per tool, so usage instructions are assumed static;
+        for tools with a mode parameter they come from calling the tool once.
+        """
+        # Callers get their own copy, so changes to it don't leak into the cache
+        info = self._tool_info_cache.get(name)
+        if info is not None:
+            return dict(info)
+        
         tool = self.tools.get(name)
         
         if not tool:
@@ -335,12 +385,14 @@ class ToolRegistry:
                 "required": details.get("required", False)
             })
         
-        return {
+        info = {
             "name": tool.name,
             "description": tool.description,
             "parameters": params,
             "usage_instructions": tool.get_usage_instructions()
         }
+        self._tool_info_cache[name] = info
+        return dict(info)
     
     def run_tool(self, name: str, args: List[str] = None, kwargs: Dict[str, Any] = None) -> Any:
         """Run a tool with the provided arguments"""
@@ -363,7 +415,7 @@ class ToolRegistry:
                 result = tool.execute(**converted_kwargs)
             else:
                 # Convert positional arguments
-                sig_params = list(tool.sig.parameters.keys())
+                sig_params = tool.param_names
                 parsed_args = {}
                 
                 if args:
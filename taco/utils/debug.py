@@ -22,6 +22,10 @@ def get_debug_level() -> DebugLevel:
     except KeyError:
         return DebugLevel.INFO
 
+def debug_enabled(level: DebugLevel = DebugLevel.DEBUG) -> bool:
+    """Check whether messages at level would be printed"""
+    return level <= get_debug_level()
+
 def debug_print(*args: Any, level: DebugLevel = DebugLevel.DEBUG) -> None:
     """Print debug message if level is sufficient"""
     current_level = get_debug_level()
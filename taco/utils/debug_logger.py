@@ -3,10 +3,11 @@ TACO Debug Logger
 Handles comprehensive debug logging for the entire system.
 """
 import os
-import json
 from rich.console import Console
 from typing import Dict, List, Any, Optional
 
+from taco.utils import jsonio
+
 console = Console()
 
 class DebugLogger:
@@ -18,7 +19,7 @@ class DebugLogger:
         
         # Check environment variable for debug level
         env_debug = os.environ.get('TACO_DEBUG_LEVEL', 'INFO').upper()
-        if env_debug in ['DEBUG', 'VERBOSE']:
+        if env_debug in ('DEBUG', 'VERBOSE'):
             self.enabled = True
     
     def enable(self):
@@ -35,7 +36,18 @@ class DebugLogger:
             return
         
         # Print to console
-        console.print(f"[{color}]DEBUG {category}: {message}[/{color}]")
+        console.print(self._format(message, category, color))
+    
+    def log_batch(self, entries: List[tuple]):
+        """Log several (message, category[, color]) entries with a single print"""
+        if not self.enabled:
+            return
+        
+        console.print("\n".join(self._format(*entry) for entry in entries))
+    
+    def _format(self, message: str, category: str = "INFO", color: str = "blue") -> str:
+        """Format a debug message as console markup"""
+        return f"[{color}]DEBUG {category}: {message}[/{color}]"
     
     def log_error(self, message: str):
         """Log an error message"""
@@ -56,7 +68,7 @@ class DebugLogger:
         
         if isinstance(data, dict) or isinstance(data, list):
             try:
-                json_str = json.dumps(data, indent=2)
+                json_str = jsonio.dumps(data, indent=True)
                 if len(json_str) > 1000:
                     json_str = json_str[:1000] + "... (truncated)"
                 self.log(f"{label}:\n{json_str}", "JSON", "cyan")
@@ -0,0 +1,58 @@
+"""
+TACO JSON Utilities
+Uses orjson when it is installed, falling back to the stdlib json module.
+Both produce the same text: compact separators, non-ASCII characters
+unescaped and non-str keys turned into strings.
+"""
+import json
+from typing import Any, Callable, Optional, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def loads(data: Union[str, bytes, memoryview]) -> Any:
+    """Parse JSON from a str, bytes or buffer object"""
+    if orjson is not None:
+        return orjson.loads(data)
+
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+def dumps(data: Any, indent: bool = False, default: Optional[Callable[[Any], Any]] = None) -> str:
+    """Serialize data to a JSON string, indented by two spaces if requested"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(data, default=default, option=option).decode()
+        except TypeError:
+            # orjson rejects some valid data, such as integers beyond 64 bits,
+            # without consulting default; the stdlib encoder handles those
+            pass
+
+    try:
+        return _stdlib_dumps(data, indent, default)
+    except TypeError:
+        # Keys json can't encode, such as tuples, become their str()
+        return _stdlib_dumps(_stringify_keys(data), indent, default)
+
+def _stdlib_dumps(data: Any, indent: bool, default: Optional[Callable[[Any], Any]]) -> str:
+    """Serialize with the json module, formatted as orjson would"""
+    if indent:
+        return json.dumps(data, indent=2, ensure_ascii=False, default=default)
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False, default=default)
+
+def _stringify_keys(data: Any) -> Any:
+    """Copy data with every dict key that isn't a JSON scalar replaced by its str()"""
+    if isinstance(data, dict):
+        return {
+            key if key is None or isinstance(key, (str, int, float, bool)) else str(key): _stringify_keys(value)
+            for key, value in data.items()
+        }
+    if isinstance(data, (list, tuple)):
+        return [_stringify_keys(item) for item in data]
+    return data
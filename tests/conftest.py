@@ -0,0 +1,6 @@
+"""
+Shared test setup
+"""
+# Load taco.core first, as the CLI does: taco.core.chat imports the tool
+# registry, so importing taco.tools first runs into the import cycle
+import taco.core  # noqa: F401
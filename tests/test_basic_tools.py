@@ -0,0 +1,52 @@
+"""
+Tests for the basic calculator tools
+"""
+import sys
+
+import pytest
+
+from taco.tools.builtin.basic import calculate_compound_interest_batch
+
+
+def batch_without_numpy(monkeypatch, *args, **kwargs):
+    """Run the batch calculator on its pure-Python path"""
+    with monkeypatch.context() as patch:
+        # A None entry makes 'import numpy' raise ImportError
+        patch.setitem(sys.modules, 'numpy', None)
+        return calculate_compound_interest_batch(*args, **kwargs)
+
+
+@pytest.fixture(params=["numpy", "python"])
+def run_batch(request, monkeypatch):
+    """The batch calculator on each of its two paths"""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+        return calculate_compound_interest_batch
+    return lambda *args, **kwargs: batch_without_numpy(monkeypatch, *args, **kwargs)
+
+
+@pytest.mark.parametrize("principal, rate, time", [
+    (10000, 0.05, 10),
+    ([10000, 20000, 5000], [0.05, 0.04, 6], 10),
+    ([1000], 5, [1, 2.5, 30]),
+    (["1500", 2500], "3.5", 7),
+    ((100, 200), 0.1, (1, 2)),
+])
+def test_batch_paths_agree(monkeypatch, principal, rate, time):
+    pytest.importorskip("numpy")
+    with_numpy = calculate_compound_interest_batch(principal, rate, time, compounds_per_year=4)
+    without_numpy = batch_without_numpy(monkeypatch, principal, rate, time, compounds_per_year=4)
+    assert with_numpy == without_numpy
+
+
+def test_batch_scalars_return_lists(run_batch):
+    assert run_batch(10000, 0.05, 10) == {
+        "final_amount": [16470.09],
+        "interest_earned": [6470.09],
+        "input_rate_percent": [5.0]
+    }
+
+
+def test_batch_rejects_mismatched_lengths(run_batch):
+    with pytest.raises(ValueError, match="same length"):
+        run_batch([1000, 2000, 3000], [0.05, 0.04], 10)
@@ -0,0 +1,76 @@
+"""
+Tests for saving and loading chat history
+"""
+import json
+import queue
+import threading
+
+from taco.core.chat import ChatSession
+
+
+def make_session(monkeypatch):
+    """Build a ChatSession with only the history machinery set up"""
+    monkeypatch.setattr("taco.core.chat.HISTORY_SAVE_DELAY", 0)
+    session = ChatSession.__new__(ChatSession)
+    # Same history state as ChatSession.__init__
+    session.history = []
+    session._history_queue = queue.Queue()
+    session._history_pending = {}
+    session._history_saved = {}
+    session._history_lock = threading.Lock()
+    session._history_stop = threading.Event()
+    session._history_thread = None
+    return session
+
+
+def read_lines(path):
+    return [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+
+
+def test_history_saved_as_json_lines_and_appended(monkeypatch, tmp_path):
+    path = tmp_path / "session.jsonl"
+    session = make_session(monkeypatch)
+    
+    session.history.append({"role": "user", "content": "héllo"})
+    session.save_history(str(path))
+    assert session.commit_history()
+    assert read_lines(path) == session.history
+    
+    session.history.append({"role": "assistant", "content": "line one\nline two"})
+    session.save_history(str(path))
+    assert session.commit_history()
+    assert read_lines(path) == session.history
+    
+    loaded = make_session(monkeypatch)
+    loaded.load_history(str(path))
+    assert loaded.history == session.history
+
+
+def test_legacy_json_array_history_loads(monkeypatch, tmp_path):
+    path = tmp_path / "session.json"
+    history = [{"role": "user", "content": "hi"}, {"role": "assistant", "content": "hello"}]
+    path.write_text(json.dumps(history, indent=2), encoding='utf-8')
+    
+    session = make_session(monkeypatch)
+    session.load_history(str(path))
+    assert session.history == history
+
+
+def test_failed_append_rewrites_file_on_next_save(monkeypatch, tmp_path):
+    path = tmp_path / "session.jsonl"
+    session = make_session(monkeypatch)
+    
+    session.history.append({"role": "user", "content": "first"})
+    session.save_history(str(path))
+    assert session.commit_history()
+    
+    # An entry JSON can't encode makes the append fail
+    session.history.append({"role": "assistant", "content": object()})
+    session.save_history(str(path))
+    assert session.commit_history()
+    assert str(path) not in session._history_saved
+    
+    session.history[-1] = {"role": "assistant", "content": "second"}
+    session.save_history(str(path))
+    assert session.commit_history()
+    assert read_lines(path) == session.history
@@ -0,0 +1,108 @@
+"""
+Tests for ChatSession tool call execution order and context defaults
+"""
+import inspect
+import threading
+
+from taco.core.chat import ChatSession
+from taco.core.tool_stack import ToolStack
+from taco.tools.registry import Tool
+
+
+class FakeRegistry:
+    """Registry holding just the tools a test needs"""
+    
+    def __init__(self, *funcs):
+        self.tools = {func.__name__: Tool(func) for func in funcs}
+
+
+class FakeContextManager:
+    """Context manager keeping parameter defaults in memory"""
+    
+    def __init__(self):
+        self.defaults = {}
+    
+    def check_missing_parameters(self, func, kwargs):
+        updated = dict(kwargs)
+        missing = []
+        for name, param in inspect.signature(func).parameters.items():
+            if kwargs.get(name) in (None, ""):
+                if name in self.defaults:
+                    updated[name] = self.defaults[name]
+                elif param.default is param.empty:
+                    missing.append(name)
+        return updated, missing
+    
+    def update_parameter_default(self, param_name, value, persist=True):
+        self.defaults[param_name] = value
+
+
+def make_session(*funcs):
+    """Build a ChatSession with only the parts tool execution uses"""
+    session = ChatSession.__new__(ChatSession)
+    session.debug_mode = False
+    session.tool_registry = FakeRegistry(*funcs)
+    session.context_manager = FakeContextManager()
+    session.tool_stack = ToolStack()
+    # A non-empty stack means calls execute rather than return usage instructions
+    session.tool_stack.push('workflow')
+    return session
+
+
+def call(tool_name, **parameters):
+    return {'tool_name': tool_name, 'parameters': parameters}
+
+
+def test_dependent_and_independent_calls():
+    calls_seen = []
+    # Both independent calls must be running at once to get past the barrier
+    barrier = threading.Barrier(2, timeout=5)
+    
+    def make_project(workingdir: str) -> str:
+        calls_seen.append(('make_project', workingdir))
+        return f"made {workingdir}"
+    
+    def save_project(name: str, workingdir: str) -> str:
+        calls_seen.append(('save_project', workingdir))
+        return f"saved {name} in {workingdir}"
+    
+    def double(value: int) -> int:
+        barrier.wait()
+        return value * 2
+    double._thread_safe = True
+    
+    session = make_session(make_project, save_project, double)
+    results = session._execute_tool_calls([
+        call('make_project', workingdir='/tmp/project'),
+        call('save_project', name='main.py'),
+        call('double', value=2),
+        call('double', value=5),
+    ])
+    
+    assert [r['tool'] for r in results] == ['make_project', 'save_project', 'double', 'double']
+    assert all(r['success'] for r in results)
+    # save_project left out workingdir and gets the one make_project just used
+    assert calls_seen == [('make_project', '/tmp/project'), ('save_project', '/tmp/project')]
+    assert results[1]['result'] == "saved main.py in /tmp/project"
+    assert [r['result'] for r in results[2:]] == [4, 10]
+
+
+def test_tools_not_marked_thread_safe_run_one_at_a_time():
+    active = []
+    overlaps = []
+    lock = threading.Lock()
+    
+    def slow(value: int) -> int:
+        with lock:
+            active.append(value)
+            overlaps.append(len(active))
+        threading.Event().wait(0.05)
+        with lock:
+            active.remove(value)
+        return value
+    
+    session = make_session(slow)
+    results = session._execute_tool_calls([call('slow', value=i) for i in range(3)])
+    
+    assert [r['result'] for r in results] == [0, 1, 2]
+    assert max(overlaps) == 1
@@ -0,0 +1,39 @@
+"""
+Tests for slash command dispatch in the chat command handler.
+"""
+from types import SimpleNamespace
+
+from taco.core.command_handler import CommandHandler
+
+
+def make_handler():
+    """Build a handler around a minimal chat session"""
+    chat = SimpleNamespace(debug_mode=False)
+    return CommandHandler(chat)
+
+
+def test_exact_command_is_dispatched():
+    assert "Available commands" in make_handler().handle_command('/help')
+
+
+def test_unambiguous_prefix_is_dispatched():
+    assert "Available commands" in make_handler().handle_command('/hel')
+
+
+def test_ambiguous_prefix_lists_candidates():
+    result = make_handler().handle_command('/c')
+    assert result.startswith("Ambiguous command: /c")
+
+
+def test_bare_slash_is_unknown():
+    assert make_handler().handle_command('/') == "Unknown command: /"
+
+
+def test_empty_command_is_unknown():
+    assert make_handler().handle_command('   ').startswith("Unknown command")
+
+
+def test_complete_is_case_insensitive_and_sorted():
+    matches = make_handler().complete('/CL')
+    assert matches == sorted(matches)
+    assert '/clear' in matches
@@ -0,0 +1,79 @@
+"""
+Tests for config loading, caching and dotted-key updates.
+"""
+import os
+
+import pytest
+
+from taco.core import config
+
+
+@pytest.fixture
+def config_file(tmp_path, monkeypatch):
+    """Point the config module at a fresh file with an empty cache"""
+    path = str(tmp_path / "config.json")
+    monkeypatch.setattr(config, "_config_path", path)
+    monkeypatch.setattr(config, "_config_cache", None)
+    return path
+
+
+def test_missing_file_is_created_with_defaults(config_file):
+    assert config.get_config() == config.DEFAULT_CONFIG
+    assert os.path.exists(config_file)
+
+
+def test_unchanged_file_is_not_reparsed(config_file, monkeypatch):
+    config.get_config()
+    config.get_config()
+    
+    def fail(data):
+        raise AssertionError("config was parsed again")
+    monkeypatch.setattr(config.jsonio, "loads", fail)
+    assert config.get_config()["model"]["default"] == config.DEFAULT_CONFIG["model"]["default"]
+
+
+def test_external_edit_is_picked_up(config_file):
+    config.get_config()
+    with open(config_file, 'w', encoding='utf-8') as f:
+        f.write('{"model": {"default": "edited"}}')
+    os.utime(config_file, ns=(1, 1))
+    
+    loaded = config.get_config()
+    assert loaded["model"] == {"default": "edited"}
+    assert loaded["display"] == config.DEFAULT_CONFIG["display"]
+
+
+def test_callers_get_independent_copies(config_file):
+    config.get_config()
+    first = config.get_config()
+    first["model"]["default"] = "changed"
+    assert config.get_config()["model"]["default"] != "changed"
+
+
+def test_save_config_updates_cache(config_file):
+    data = config.get_config()
+    data["model"]["default"] = "saved"
+    assert config.save_config(data)
+    
+    data["model"]["default"] = "mutated after save"
+    assert config.get_config()["model"]["default"] == "saved"
+
+
+def test_set_config_value_creates_sections(config_file):
+    assert config.set_config_value("tools.create_code.model", "codellama")
+    assert config.set_config_value("new.key", 1)
+    
+    loaded = config.get_config()
+    assert loaded["tools"]["create_code"]["model"] == "codellama"
+    assert loaded["new"] == {"key": 1}
+
+
+@pytest.mark.parametrize("key", ["model", "model.", ".default", "model..default"])
+def test_set_config_value_rejects_malformed_keys(config_file, key):
+    assert not config.set_config_value(key, "x")
+
+
+def test_set_config_value_keeps_sections(config_file):
+    assert not config.set_config_value("tools.create_code", "flat")
+    assert not config.set_config_value("model.default.name", "x")
+    assert config.get_config()["model"]["default"] == config.DEFAULT_CONFIG["model"]["default"]
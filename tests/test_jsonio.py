@@ -0,0 +1,68 @@
+"""
+Tests for the JSON helpers, which must give the same text with or without orjson.
+"""
+import pytest
+
+from taco.utils import jsonio
+
+orjson = pytest.importorskip("orjson")
+
+SAMPLES = [
+    {"name": "taco", "count": 3, "ratio": 0.5, "ok": True, "missing": None},
+    {"nested": {"list": [1, [2, 3], {"a": []}], "empty": {}}},
+    {"text": "café ✓ \U0001f32e", "quote": "say \"hi\"\n"},
+    {1: "one", 2.5: "two and a half", True: "yes"},
+    [1, "two", None, False],
+    "plain string",
+    42,
+]
+
+
+def both_backends(monkeypatch, func):
+    """Call func with orjson enabled and then with the stdlib fallback"""
+    with_orjson = func()
+    monkeypatch.setattr(jsonio, "orjson", None)
+    without_orjson = func()
+    monkeypatch.setattr(jsonio, "orjson", orjson)
+    return with_orjson, without_orjson
+
+
+@pytest.mark.parametrize("indent", [False, True])
+@pytest.mark.parametrize("data", SAMPLES)
+def test_backends_produce_same_text(monkeypatch, data, indent):
+    fast, slow = both_backends(monkeypatch, lambda: jsonio.dumps(data, indent=indent))
+    assert fast == slow
+
+
+def test_big_integers_fall_back_to_stdlib():
+    data = {"big": 2 ** 70, "negative": -(2 ** 70)}
+    assert jsonio.loads(jsonio.dumps(data)) == data
+
+
+@pytest.mark.parametrize("indent", [False, True])
+def test_tuple_keys_become_strings(monkeypatch, indent):
+    data = {(1, 2): "pair", "inner": [{("a",): 1}]}
+    fast, slow = both_backends(monkeypatch, lambda: jsonio.dumps(data, indent=indent))
+    assert fast == slow
+    assert jsonio.loads(fast) == {"(1, 2)": "pair", "inner": [{"('a',)": 1}]}
+
+
+def test_default_handles_unknown_types(monkeypatch):
+    data = {"empty": frozenset(), "obj": object}
+    fast, slow = both_backends(monkeypatch, lambda: jsonio.dumps(data, default=str))
+    assert fast == slow
+    assert jsonio.loads(fast) == {"empty": "frozenset()", "obj": str(object)}
+
+
+def test_unknown_types_without_default_raise(monkeypatch):
+    with pytest.raises(TypeError):
+        jsonio.dumps({"obj": object()})
+    monkeypatch.setattr(jsonio, "orjson", None)
+    with pytest.raises(TypeError):
+        jsonio.dumps({"obj": object()})
+
+
+@pytest.mark.parametrize("data", [b'{"a": [1, 2]}', '{"a": [1, 2]}', memoryview(b'{"a": [1, 2]}')])
+def test_loads_accepts_str_bytes_and_buffers(monkeypatch, data):
+    fast, slow = both_backends(monkeypatch, lambda: jsonio.loads(data))
+    assert fast == slow == {"a": [1, 2]}
@@ -0,0 +1,67 @@
+"""
+Tests for tool call parsing and stripping in MessageHandler
+"""
+from taco.core.message_handler import MessageHandler
+
+
+RESPONSE = (
+    "Let me work that out.\n"
+    "```json\n"
+    '{"tool_call": {"name": "create_code", "parameters": {"code": "print(1)"}}}\n'
+    "```\n"
+    "And a broken block:\n"
+    "```json\n"
+    '{"tool_call": {"name": "oops"\n'
+    "```\n"
+    "Then another call.\n"
+    "```json\n"
+    '{"tool_call": {"name": "convert_temperature", "parameters": {"value": 32, "from_unit": "F", "to_unit": "C"}}}\n'
+    "```\n"
+    "Done."
+)
+
+
+def test_parse_tool_calls_finds_valid_blocks():
+    calls = MessageHandler().parse_tool_calls(RESPONSE)
+    
+    assert [call['tool_name'] for call in calls] == ['create_code', 'convert_temperature']
+    assert calls[1]['parameters'] == {"value": 32, "from_unit": "F", "to_unit": "C"}
+    for call in calls:
+        start, end = call['span']
+        assert RESPONSE[start:end] == call['original_text']
+        assert call['original_text'].startswith("```json") and call['original_text'].endswith("```")
+
+
+def test_parse_tool_calls_ignores_responses_without_blocks():
+    assert MessageHandler().parse_tool_calls("No tools needed here.") == []
+
+
+def test_reparse_is_not_affected_by_callers_rewriting_parameters():
+    handler = MessageHandler()
+    calls = handler.parse_tool_calls(RESPONSE)
+    # ChatSession renames create_code's 'code' parameter in place
+    calls[0]['parameters']['prompt'] = calls[0]['parameters'].pop('code')
+    
+    again = handler.parse_tool_calls(RESPONSE)
+    assert again[0]['parameters'] == {"code": "print(1)"}
+
+
+def test_strip_tool_calls_with_spans_and_without():
+    handler = MessageHandler()
+    calls = handler.parse_tool_calls(RESPONSE)
+    stripped = handler.strip_tool_calls_from_response(RESPONSE, calls)
+    
+    # The broken block isn't a tool call, so it stays
+    assert stripped == (
+        "Let me work that out.\n"
+        "\nAnd a broken block:\n"
+        "```json\n"
+        '{"tool_call": {"name": "oops"\n'
+        "```\n"
+        "Then another call.\n"
+        "\nDone."
+    )
+    
+    # Calls without recorded spans are removed by their text instead
+    without_spans = [{k: v for k, v in call.items() if k != 'span'} for call in calls]
+    assert handler.strip_tool_calls_from_response(RESPONSE, without_spans) == stripped